@@ -53,25 +53,114 @@ Notes:
 - Use --type to override auto-detection if needed
 - Surface preprocessing (--surf) is enabled by default; use --no-surf to disable
 - Aseg and aparc table generation are enabled by default; use --no-aseg/--no-aparc to disable
+
+Exit status:
+  0   success
+  1   setup error (missing dependencies, output directory not writable, prompt declined)
+  2   invalid input (subjects_dir, participants.tsv or QDEC missing or unusable)
+  4+  bitmask of failed optional stages: aseg=4, aparc=8, surf=16, qc=32
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
+import logging
 import os
 import csv
+import io
 import re
 import sys
 import shutil
 import subprocess
+import threading
 import datetime
+import functools
+import hashlib
+import heapq
+import importlib.util
+import operator
+import stat
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from enum import IntFlag
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Set
+
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
 
+logger = logging.getLogger(__name__)
 
 SUBJECT_DIR_PATTERN = re.compile(r"^(?P<base>sub-[^/]+?)(?:_(?P<ses>ses-[^/]+))?$")
 SES_NUM_PATTERN = re.compile(r"^ses-(?P<num>\d+)$")
+_SPLIT_RE = re.compile(r"[,\s]+")
+# Alternate participants.tsv column names tried when the requested column is missing
+_PARTICIPANT_ALTS = ("participant", "sub", "subject_id", "subject")
+_SESSION_ALTS = ("session", "ses", "visit")
+
+
+@functools.lru_cache(maxsize=None)
+def _fs_bin_index() -> Tuple[str, FrozenSet[str]]:
+    """($FREESURFER_HOME/bin, names listed in it), from a single directory listing.
+
+    Only names are indexed; executability is checked when a tool is looked up.
+    Empty when FREESURFER_HOME is unset or its bin/ is unreadable.
+    """
+    fs_home = os.environ.get("FREESURFER_HOME")
+    if not fs_home:
+        return "", frozenset()
+    bin_dir = os.path.join(fs_home, "bin")
+    try:
+        with os.scandir(bin_dir) as it:
+            return bin_dir, frozenset(e.name for e in it)
+    except OSError:
+        return "", frozenset()
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Memoized tool lookup.
+
+    $FREESURFER_HOME/bin takes precedence over $PATH (a sourced FreeSurfer puts it first on
+    PATH anyway); tools outside it, or any tool when FREESURFER_HOME is unset, fall back to
+    shutil.which.
+    """
+    bin_dir, names = _fs_bin_index()
+    if name in names:
+        full = os.path.join(bin_dir, name)
+        if os.path.isfile(full) and os.access(full, os.X_OK):
+            return full
+    return shutil.which(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _fs_env(subjects_dir: Path) -> Dict[str, str]:
+    """Environment for FreeSurfer tools with SUBJECTS_DIR set (absolute).
+
+    Built once per subjects_dir and shared by all subprocess calls; callers must not
+    mutate the returned dict. OMP_NUM_THREADS defaults to 1 since stages and surface
+    jobs run concurrently; an explicit value in the environment is kept.
+    """
+    env = os.environ.copy()
+    env["SUBJECTS_DIR"] = str(subjects_dir.resolve())
+    env.setdefault("OMP_NUM_THREADS", "1")
+    return env
+
+
+def invalidate_tool_cache() -> None:
+    """Forget memoized tool paths and FreeSurfer environments.
+
+    For long-running callers that change PATH or the environment between runs.
+    """
+    _fs_bin_index.cache_clear()
+    _which.cache_clear()
+    _fs_env.cache_clear()
 
 
 def _coerce_list(val) -> Optional[List[str]]:
@@ -80,12 +169,7 @@ def _coerce_list(val) -> Optional[List[str]]:
     if isinstance(val, (list, tuple)):
         return [str(x) for x in val]
     # split on comma or whitespace
-    s = str(val).strip()
-    if not s:
-        return []
-    if "," in s:
-        return [x.strip() for x in s.split(",") if x.strip()]
-    return [x for x in s.split() if x]
+    return [x for x in _SPLIT_RE.split(str(val)) if x]
 
 
 def _coerce_int_list(val) -> Optional[List[int]]:
@@ -101,6 +185,76 @@ def _coerce_int_list(val) -> Optional[List[int]]:
     return out
 
 
+def _load_json(fh):
+    """Parse a JSON file object, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(fh.read())
+    return json.load(fh)
+
+
+def _cfg_path(val) -> Optional[Path]:
+    return Path(val) if val else None
+
+
+def _cfg_str(val) -> Optional[str]:
+    return str(val) if val else None
+
+
+# Config keys applied as argparse defaults: (dest, coerce). Config keys match the argparse
+# dests and may use hyphens instead of underscores; a coerce result of None leaves the
+# parser default untouched.
+_CFG_SPEC: List[Tuple[str, Callable[[object], object]]] = [
+    ("participants", _cfg_path),
+    ("subjects_dir", _cfg_path),
+    ("output", _cfg_path),
+    ("participant_column", _cfg_str),
+    ("session_column", _cfg_str),
+    ("include_columns", _coerce_list),
+    ("strict", bool),
+    ("bids", _cfg_path),
+    ("list_limit", int),
+    ("force", bool),
+    ("jobs", int),
+    ("fail_fast", bool),
+    ("verify_long", bool),
+    ("link_long", bool),
+    ("link_dry_run", bool),
+    ("link_force", bool),
+    ("ignore_symlink_targets", bool),
+    ("aseg", bool),
+    ("aparc", bool),
+    ("aparc_parc", _cfg_str),
+    ("aparc_measures", lambda v: _coerce_list(v) or ["thickness", "area", "volume"]),
+    ("aparc_hemis", lambda v: _coerce_list(v) or ["lh", "rh"]),
+    ("skip_sub", str),
+    ("skip_file", Path),
+    ("surf", bool),
+    ("surf_target", _cfg_str),
+    ("surf_measures", lambda v: _coerce_list(v) or ["thickness"]),
+    ("surf_hemis", lambda v: _coerce_list(v) or ["lh", "rh"]),
+    ("smooth", lambda v: ",".join(map(str, _coerce_int_list(v) or []))),
+    ("surf_outdir", Path),
+    # fsqc
+    ("qc", bool),
+    ("qc_output", Path),
+    ("qc_from", str),
+    ("qc_fastsurfer", bool),
+    ("qc_screenshots", bool),
+    ("qc_surfaces", bool),
+    ("qc_skullstrip", bool),
+    ("qc_outlier", bool),
+    ("qc_html", bool),
+    ("qc_skip_existing", bool),
+]
+
+
+def _lookup_cfg(cfg: Dict[str, object], key: str):
+    """Return cfg[key], also accepting the hyphenated form of key; None if absent."""
+    if key in cfg:
+        return cfg[key]
+    return cfg.get(key.replace("_", "-"))
+
+
 def detect_qdec_type(qdec_path: Path) -> str:
     """Detect if Qdec is cross-sectional or longitudinal.
 
@@ -157,48 +311,88 @@ def detect_qdec_type(qdec_path: Path) -> str:
         return "unknown"
 
 
-def check_dependencies(args: argparse.Namespace) -> List[str]:
+@dataclass(frozen=True)
+class ToolAvail:
+    """Availability of the external tools used by the optional stages."""
+
+    aseg: bool
+    aparc: bool
+    mris_preproc: bool
+    mri_surf2surf: bool
+    fsqc: bool
+
+
+class Stage(IntFlag):
+    """Optional stages; main() returns the bits of the stages that failed (0 if none did).
+
+    The bits start at 4 so they never collide with main()'s own error codes 1 and 2.
+    """
+
+    ASEG = 4
+    APARC = 8
+    SURF = 16
+    QC = 32
+
+
+@dataclass(frozen=True)
+class TableStage:
+    """One stats-table stage (aseg or aparc) as gated and scheduled by main()."""
+
+    name: str  # stage flag and manifest entry
+    binname: str  # FreeSurfer tool the stage runs
+    enabled: bool  # requested, and there is something to tabulate
+    available: bool
+    outputs: List[Path]  # must all exist for a manifest hit
+    inputs: List[str]  # files the tool reads, for freshness checks
+    run: Callable[..., int]
+    kw: Dict[str, object]  # stage-specific arguments to run; part of the stage key
+    skip_msg: str
+
+
+def probe_tools() -> ToolAvail:
+    """Probe all optional tools once.
+
+    fsqc counts as available via the run_fsqc command or an installed fsqc module; the
+    module is located without importing it.
+    """
+    return ToolAvail(
+        aseg=_which("asegstats2table") is not None,
+        aparc=_which("aparcstats2table") is not None,
+        mris_preproc=_which("mris_preproc") is not None,
+        mri_surf2surf=_which("mri_surf2surf") is not None,
+        fsqc=_which("run_fsqc") is not None or importlib.util.find_spec("fsqc") is not None,
+    )
+
+
+def check_dependencies(args: argparse.Namespace, tools: Optional[ToolAvail] = None) -> List[str]:
     """Check for required dependencies and return list of missing tools/packages.
 
+    Args:
+        tools: Result of probe_tools(); probed here if omitted.
+
     Returns:
         List of missing dependencies with installation instructions.
     """
+    if tools is None:
+        tools = probe_tools()
     missing = []
 
     # Check FreeSurfer tools
-    if args.aseg and not args.link_dry_run:
-        if shutil.which("asegstats2table") is None:
-            missing.append("asegstats2table (FreeSurfer) - ensure FreeSurfer is sourced")
+    if args.aseg and not args.link_dry_run and not tools.aseg:
+        missing.append("asegstats2table (FreeSurfer) - ensure FreeSurfer is sourced")
 
-    if args.aparc and not args.link_dry_run:
-        if shutil.which("aparcstats2table") is None:
-            missing.append("aparcstats2table (FreeSurfer) - ensure FreeSurfer is sourced")
+    if args.aparc and not args.link_dry_run and not tools.aparc:
+        missing.append("aparcstats2table (FreeSurfer) - ensure FreeSurfer is sourced")
 
     if args.surf:
-        if shutil.which("mris_preproc") is None:
+        if not tools.mris_preproc:
             missing.append("mris_preproc (FreeSurfer) - ensure FreeSurfer is sourced")
-        if shutil.which("mri_surf2surf") is None:
+        if not tools.mri_surf2surf:
             missing.append("mri_surf2surf (FreeSurfer) - ensure FreeSurfer is sourced")
 
     # Check Python packages
-    if args.qc:
-        # Check for fsqc - try both command and Python module import
-        fsqc_available = False
-
-        # First try the run_fsqc command
-        if shutil.which("run_fsqc") is not None:
-            fsqc_available = True
-        else:
-            # If command not found, try importing the Python module
-            try:
-                import fsqc  # noqa: F401
-
-                fsqc_available = True
-            except ImportError:
-                pass
-
-        if not fsqc_available:
-            missing.append("fsqc (Python package) - install with: bash scripts/install.sh")
+    if args.qc and not tools.fsqc:
+        missing.append("fsqc (Python package) - install with: bash scripts/install.sh")
 
     return missing
 
@@ -220,11 +414,13 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         if not cfg_path.exists():
             raise FileNotFoundError(f"Config file not found: {cfg_path}")
         with cfg_path.open("r") as fh:
-            cfg = json.load(fh)
+            cfg = _load_json(fh)
 
     p = argparse.ArgumentParser(
         description="Analyze FreeSurfer Qdec files: statistical tables, surface prep, and QC",
         parents=[p0],
+        epilog="Exit status: 0 success; 1 setup error; 2 invalid input; otherwise a bitmask of "
+        "the failed optional stages (aseg=4, aparc=8, surf=16, qc=32).",
     )
 
     # Primary input arguments
@@ -322,6 +518,21 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         default=None,
         help="Run a small pilot/sample analysis using the first N subject bases (default when flag used without value: 3).",
     )
+    io_group.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Max number of optional stages (aseg/aparc/surf/qc) run concurrently, and of "
+        "aparcstats2table calls within the aparc stage (default: 4)",
+    )
+    io_group.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Do not start further optional stages once one has failed (stages already running "
+        "with --jobs > 1 are completed). The exit status is a "
+        "bitmask of the failed stages (aseg=4, aparc=8, surf=16, qc=32); stages that were not "
+        "started are counted as failed",
+    )
     # Convenience: run the whole pipeline under nohup and exit the parent process
     io_group.add_argument(
         "--nohup",
@@ -351,6 +562,12 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="If an existing symlink points elsewhere, replace it (does not delete real directories)",
     )
+    long_group.add_argument(
+        "--ignore-symlink-targets",
+        action="store_true",
+        help="Treat any existing <fsid>.long.<base> symlink as present without resolving its target "
+        "(faster on network filesystems; assumes existing links are valid)",
+    )
 
     # Statistical tables (aseg/aparc)
     tables_group = p.add_argument_group("Statistical tables (aseg/aparc)")
@@ -504,101 +721,27 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     )
     # Apply config defaults if provided
     if cfg:
-        # Map config keys directly to argparse dests; allow hyphen or underscore forms
-        def get_cfg(key: str, default=None):
-            if key in cfg:
-                return cfg[key]
-            alt = key.replace("_", "-")
-            if alt in cfg:
-                return cfg[alt]
-            alt2 = key.replace("-", "_")
-            if alt2 in cfg:
-                return cfg[alt2]
-            return default
-
         # Pre-seed defaults from config; lists may be given as list or comma strings
-        if get_cfg("participants"):
-            p.set_defaults(participants=Path(get_cfg("participants")))
-        if get_cfg("subjects_dir") or get_cfg("subjects-dir"):
-            p.set_defaults(subjects_dir=Path(get_cfg("subjects_dir") or get_cfg("subjects-dir")))
-        if get_cfg("output"):
-            p.set_defaults(output=Path(get_cfg("output")))
-        if get_cfg("participant_column"):
-            p.set_defaults(participant_column=str(get_cfg("participant_column")))
-        if get_cfg("session_column"):
-            p.set_defaults(session_column=str(get_cfg("session_column")))
-        if get_cfg("include_columns") is not None:
-            p.set_defaults(include_columns=_coerce_list(get_cfg("include_columns")))
-        if get_cfg("strict") is not None:
-            p.set_defaults(strict=bool(get_cfg("strict")))
-        if get_cfg("bids"):
-            p.set_defaults(bids=Path(get_cfg("bids")))
-        if get_cfg("list_limit") is not None:
-            p.set_defaults(list_limit=int(get_cfg("list_limit")))
-        if get_cfg("force") is not None:
-            p.set_defaults(force=bool(get_cfg("force")))
-        if get_cfg("verify_long") is not None:
-            p.set_defaults(verify_long=bool(get_cfg("verify_long")))
-        if get_cfg("link_long") is not None:
-            p.set_defaults(link_long=bool(get_cfg("link_long")))
-        if get_cfg("link_dry_run") is not None:
-            p.set_defaults(link_dry_run=bool(get_cfg("link_dry_run")))
-        if get_cfg("link_force") is not None:
-            p.set_defaults(link_force=bool(get_cfg("link_force")))
-        if get_cfg("aseg") is not None:
-            p.set_defaults(aseg=bool(get_cfg("aseg")))
-        if get_cfg("aparc") is not None:
-            p.set_defaults(aparc=bool(get_cfg("aparc")))
-        if get_cfg("aparc_parc"):
-            p.set_defaults(aparc_parc=str(get_cfg("aparc_parc")))
-        if get_cfg("aparc_measures") is not None:
-            p.set_defaults(
-                aparc_measures=_coerce_list(get_cfg("aparc_measures"))
-                or ["thickness", "area", "volume"]
-            )
-        if get_cfg("aparc_hemis") is not None:
-            p.set_defaults(aparc_hemis=_coerce_list(get_cfg("aparc_hemis")) or ["lh", "rh"])
-        if get_cfg("skip_sub") is not None:
-            p.set_defaults(skip_sub=str(get_cfg("skip_sub")))
-        if get_cfg("skip_file") is not None:
-            p.set_defaults(skip_file=Path(get_cfg("skip_file")))
-        if get_cfg("surf") is not None:
-            p.set_defaults(surf=bool(get_cfg("surf")))
-        if get_cfg("surf_target"):
-            p.set_defaults(surf_target=str(get_cfg("surf_target")))
-        if get_cfg("surf_measures") is not None:
-            p.set_defaults(surf_measures=_coerce_list(get_cfg("surf_measures")) or ["thickness"])
-        if get_cfg("surf_hemis") is not None:
-            p.set_defaults(surf_hemis=_coerce_list(get_cfg("surf_hemis")) or ["lh", "rh"])
-        if get_cfg("smooth") is not None:
-            p.set_defaults(smooth=",".join(map(str, _coerce_int_list(get_cfg("smooth")) or [])))
-        elif get_cfg("surf_fwhm") is not None:
-            p.set_defaults(surf_fwhm=int(get_cfg("surf_fwhm")))
-        if get_cfg("surf_outdir") is not None:
-            p.set_defaults(surf_outdir=Path(get_cfg("surf_outdir")))
-        # fsqc
-        if get_cfg("qc") is not None:
-            p.set_defaults(qc=bool(get_cfg("qc")))
-        if get_cfg("qc_output") is not None:
-            p.set_defaults(qc_output=Path(get_cfg("qc_output")))
-        if get_cfg("qc_from") is not None:
-            p.set_defaults(qc_from=str(get_cfg("qc_from")))
-        if get_cfg("qc_fastsurfer") is not None:
-            p.set_defaults(qc_fastsurfer=bool(get_cfg("qc_fastsurfer")))
-        if get_cfg("qc_screenshots") is not None:
-            p.set_defaults(qc_screenshots=bool(get_cfg("qc_screenshots")))
-        if get_cfg("qc_surfaces") is not None:
-            p.set_defaults(qc_surfaces=bool(get_cfg("qc_surfaces")))
-        if get_cfg("qc_skullstrip") is not None:
-            p.set_defaults(qc_skullstrip=bool(get_cfg("qc_skullstrip")))
-        if get_cfg("qc_outlier") is not None:
-            p.set_defaults(qc_outlier=bool(get_cfg("qc_outlier")))
-        if get_cfg("qc_html") is not None:
-            p.set_defaults(qc_html=bool(get_cfg("qc_html")))
-        if get_cfg("qc_skip_existing") is not None:
-            p.set_defaults(qc_skip_existing=bool(get_cfg("qc_skip_existing")))
-
-    return p.parse_args(argv)
+        defaults = {}
+        for dest, coerce in _CFG_SPEC:
+            val = _lookup_cfg(cfg, dest)
+            if val is None:
+                continue
+            val = coerce(val)
+            if val is not None:
+                defaults[dest] = val
+        # --smooth supersedes the deprecated single-kernel --surf-fwhm
+        if "smooth" not in defaults and (fwhm := _lookup_cfg(cfg, "surf_fwhm")) is not None:
+            defaults["surf_fwhm"] = int(fwhm)
+        p.set_defaults(**defaults)
+
+    args = p.parse_args(argv)
+    # Resolve smoothing kernels once: --smooth if it yields any, else --surf-fwhm
+    args.smooth = _coerce_int_list(args.smooth) or [int(args.surf_fwhm)]
+    # Freeze surface selections so they can be handed on without copying
+    args.surf_measures = tuple(args.surf_measures)
+    args.surf_hemis = tuple(args.surf_hemis)
+    return args
 
 
 def prepare_output_directory(output_path: Path, force: bool = False) -> bool:
@@ -620,30 +763,41 @@ def prepare_output_directory(output_path: Path, force: bool = False) -> bool:
     # Directory exists - check if it's empty or if we should ask for confirmation
     if not force:
         try:
-            # Check if directory has any files (ignore hidden files starting with .)
-            files = [f for f in output_path.iterdir() if not f.name.startswith(".")]
+            # Check if directory has any files (ignore hidden files starting with .).
+            # Stop after the 5 entries we show plus one to know whether there are more.
+            show = 5
+            files: List[str] = []
+            with os.scandir(output_path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    files.append(entry.name)
+                    if len(files) > show:
+                        break
             if files:
-                print(
-                    f"[WARN] Output directory '{output_path}' is not empty and contains {len(files)} items."
+                more = len(files) > show
+                count = f"more than {show}" if more else str(len(files))
+                logger.warning(
+                    f"Output directory '{output_path}' is not empty and contains {count} items."
                 )
                 print("Files/directories found:")
-                for i, f in enumerate(files[:5]):  # Show first 5 items
-                    print(f"  - {f.name}")
-                if len(files) > 5:
-                    print(f"  ... and {len(files) - 5} more items")
+                for name in files[:show]:
+                    print(f"  - {name}")
+                if more:
+                    print("  ... and more items")
 
                 while True:
                     response = input("Do you want to overwrite/continue? [y/N]: ").strip().lower()
                     if response in ("y", "yes"):
-                        print("[INFO] Continuing with existing output directory.")
+                        logger.info("Continuing with existing output directory.")
                         return True
                     elif response in ("n", "no", ""):
-                        print("[INFO] Operation cancelled by user.")
+                        logger.info("Operation cancelled by user.")
                         return False
                     else:
                         print("Please enter 'y' for yes or 'n' for no.")
         except Exception as e:
-            print(f"[WARN] Could not check directory contents: {e}", file=sys.stderr)
+            logger.warning(f"Could not check directory contents: {e}")
 
     return True
 
@@ -652,96 +806,117 @@ def read_participants(
     tsv_path: Path,
     participant_col: str,
     session_col: str,
-) -> Tuple[List[str], List[Dict[str, str]], str, str]:
+    include_columns: Optional[List[str]] = None,
+) -> Tuple[List[str], List[Tuple[str, ...]], Dict[str, int], str, str]:
+    """Read participants.tsv and resolve the participant/session column names.
+
+    Rows are returned as tuples; col_index maps a column name to its position in each row,
+    e.g. ``row[col_index["age"]]``. If include_columns is given, rows only keep those
+    columns plus the participant and session columns; fieldnames always lists every
+    column of the file.
+
+    Returns (fieldnames, rows, col_index, participant_col, session_col).
+    """
     if not tsv_path.exists():
         raise FileNotFoundError(f"participants.tsv not found: {tsv_path}")
 
     with tsv_path.open("r", newline="") as f:
-        sniffer = csv.Sniffer()
-        sample = f.read(2048)
-        f.seek(0)
-        dialect = csv.excel_tab
-        if sniffer.has_header(sample):
-            pass
-        reader = csv.DictReader(f, dialect=dialect)
+        # BIDS participants.tsv is always tab-separated with a header row
+        reader = csv.reader(f, dialect=csv.excel_tab)
         # Normalize headers to their raw form but we will lookup case-insensitively
-        fieldnames = reader.fieldnames or []
-        rows = [dict(row) for row in reader]
-
-    # Case-insensitive mapping for column names
-    lower_map = {fn.lower(): fn for fn in fieldnames}
-    # Allow common alternates for participant/session
-    if participant_col.lower() not in lower_map:
-        for alt in ("participant", "sub", "subject_id", "subject"):
-            if alt in lower_map:
-                participant_col = lower_map[alt]
-                break
-    else:
-        participant_col = lower_map[participant_col.lower()]
+        fieldnames = next(reader, [])
 
-    if session_col.lower() not in lower_map:
-        for alt in ("session", "ses", "visit"):
-            if alt in lower_map:
-                session_col = lower_map[alt]
-                break
-    else:
-        session_col = lower_map[session_col.lower()]
+        # Case-insensitive mapping for column names
+        lower_map = {fn.casefold(): fn for fn in fieldnames}
+        # Allow common alternates for participant/session
+        participant_col = lower_map.get(participant_col.casefold()) or next(
+            (lower_map[alt] for alt in _PARTICIPANT_ALTS if alt in lower_map), participant_col
+        )
+        session_col = lower_map.get(session_col.casefold()) or next(
+            (lower_map[alt] for alt in _SESSION_ALTS if alt in lower_map), session_col
+        )
+
+        if include_columns:
+            # Only keep the requested covariates (plus id columns) per row
+            wanted = set(include_columns) | {participant_col, session_col}
+            keep_idx = [i for i, fn in enumerate(fieldnames) if fn in wanted]
+        else:
+            keep_idx = list(range(len(fieldnames)))
+        col_index = {fieldnames[i]: pos for pos, i in enumerate(keep_idx)}
+
+        width = len(fieldnames)
+        rows: List[Tuple[str, ...]] = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                # short rows are padded with empty values
+                row += [""] * (width - len(row))
+            rows.append(tuple(row[i] for i in keep_idx))
 
-    return fieldnames, rows, participant_col, session_col
+    return fieldnames, rows, col_index, participant_col, session_col
 
 
-def scan_subjects_dir(subjects_dir: Path) -> List[Tuple[str, str, Optional[str]]]:
-    """Return a list of (fsid, fsid_base, session_label) for each longitudinal timepoint.
+def scan_subjects_dir(
+    subjects_dir: Path,
+) -> List[Tuple[str, str, Optional[str], Optional[int]]]:
+    """Return a list of (fsid, fsid_base, session_label, tp) for each longitudinal timepoint.
+
+    tp is the numeric session index (ses-02 -> 2), or None for non-numeric session labels.
 
     Skips base-only directories (those without a _ses-* suffix).
     """
-    if not subjects_dir.exists():
-        raise FileNotFoundError(f"subjects_dir not found: {subjects_dir}")
-    if not subjects_dir.is_dir():
-        raise NotADirectoryError(f"subjects_dir is not a directory: {subjects_dir}")
-
-    entries: List[Tuple[str, str, Optional[str]]] = []
-    for child in sorted(subjects_dir.iterdir()):
-        if not child.is_dir():
-            continue
-        if ".long." in child.name:
-            # Skip longitudinal derivative directories to avoid treating them as timepoints
-            continue
-        m = SUBJECT_DIR_PATTERN.match(child.name)
-        if not m:
-            continue
+    # os.scandir exposes the entry type from readdir, avoiding one stat() per child; it also
+    # reports a missing or non-directory subjects_dir without separate checks up front
+    try:
+        with os.scandir(subjects_dir) as it:
+            # Match names first so only timepoint candidates are classified (is_dir() costs a
+            # stat only for symlinks); skip longitudinal derivative directories
+            candidates = [
+                (e.name, m)
+                for e in it
+                if ".long." not in e.name
+                and (m := SUBJECT_DIR_PATTERN.match(e.name))
+                and m.group("ses")
+                and e.is_dir()
+            ]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"subjects_dir not found: {subjects_dir}") from None
+    except NotADirectoryError:
+        raise NotADirectoryError(f"subjects_dir is not a directory: {subjects_dir}") from None
+    candidates.sort(key=operator.itemgetter(0))
+
+    entries: List[Tuple[str, str, Optional[str], Optional[int]]] = []
+    for name, m in candidates:
         base = m.group("base")
         ses = m.group("ses")
-        if ses:  # this is a timepoint directory
-            fsid = child.name
-            entries.append((fsid, base, ses))
-        # else: base-only directory, skip
+        # base-only directories (no _ses-* suffix) were skipped above
+        tp = int(m_ses.group("num")) if (m_ses := SES_NUM_PATTERN.match(ses)) else None
+        entries.append((name, base, ses, tp))
     return entries
 
 
 def session_to_tp(ses_label: Optional[str]) -> Optional[int]:
     if ses_label is None:
         return None
+    # SES_NUM_PATTERN only matches digits, so int() cannot fail here
     m = SES_NUM_PATTERN.match(ses_label)
-    if m:
-        try:
-            return int(m.group("num"))
-        except ValueError:
-            return None
-    return None
+    return int(m.group("num")) if m else None
 
 
 def build_qdec_rows(
-    timepoints: List[Tuple[str, str, Optional[str]]],
-    participants_rows: List[Dict[str, str]],
+    timepoints: List[Tuple[str, str, Optional[str], Optional[int]]],
+    participants_rows: List[Tuple[str, ...]],
+    col_index: Dict[str, int],
     participant_col: str,
     session_col: Optional[str],
     include_columns: Optional[List[str]],
     strict: bool,
-    skip_set: Optional[Set[str]] = None,
+    skip_set: FrozenSet[str] = frozenset(),
 ) -> Tuple[List[str], List[List[str]]]:
     # Normalize include columns
-    available_cols = set(participants_rows[0].keys()) if participants_rows else set()
+    # dict keys view: O(1) membership without copying, and iterates in file column order
+    available_cols = col_index.keys() if participants_rows else ()
     cols_to_include: List[str]
     if include_columns:
         # Keep only those that exist
@@ -751,28 +926,58 @@ def build_qdec_rows(
 
     header = ["fsid", "fsid-base", "tp"] + cols_to_include
 
-    def find_row(base: str, ses: Optional[str]) -> Optional[Dict[str, str]]:
-        # exact match on base and session (if column exists)
-        if session_col and session_col in available_cols and ses is not None:
-            # prefer exact match
-            for r in participants_rows:
-                if r.get(participant_col) == base and r.get(session_col) == ses:
-                    return r
-        # fallback: match by participant only
-        for r in participants_rows:
-            if r.get(participant_col) == base:
+    # Index participants rows once; setdefault keeps the first matching row like a linear scan
+    use_session = bool(session_col and session_col in available_cols)
+    sub_pos = col_index.get(participant_col)
+    ses_pos = col_index[session_col] if use_session else None
+    idx_pair: Dict[Tuple[Optional[str], str], Tuple[str, ...]] = {}
+    idx_base: Dict[Optional[str], Tuple[str, ...]] = {}
+    for r in participants_rows:
+        sub = r[sub_pos] if sub_pos is not None else None
+        if ses_pos is not None:
+            idx_pair.setdefault((sub, r[ses_pos]), r)
+        idx_base.setdefault(sub, r)
+
+    def find_row(base: str, ses: Optional[str]) -> Optional[Tuple[str, ...]]:
+        # prefer exact match on base and session (if column exists)
+        if use_session and ses is not None:
+            r = idx_pair.get((base, ses))
+            if r is not None:
                 return r
-        return None
+        # fallback: match by participant only
+        return idx_base.get(base)
 
-    rows: List[List[str]] = []
+    # (base, numeric tp or sys.maxsize, fsid, row) so sorting needs no key function
+    decorated: List[Tuple[str, int, str, List[str]]] = []
     skipped_missing_sex: List[str] = []
-    missing_tokens = {"", "na", "n/a", "nan", "null"}
+    missing_tokens = frozenset(("", "na", "n/a", "nan", "null"))
+    # Fetch all included cells of a row in one C-level call
+    col_positions = tuple(col_index[c] for c in cols_to_include)
+    if len(col_positions) == 1:
+        pos = col_positions[0]
+
+        def get_values(row: Tuple[str, ...]) -> List[str]:
+            return [row[pos]]
+
+    elif col_positions:
+        getter = operator.itemgetter(*col_positions)
+
+        def get_values(row: Tuple[str, ...]) -> List[str]:
+            return list(getter(row))
+
+    else:
+
+        def get_values(row: Tuple[str, ...]) -> List[str]:
+            return []
+
     sex_col_idx: Optional[int] = None
     if "sex" in cols_to_include:
         sex_col_idx = cols_to_include.index("sex")
+    # Bind loop invariants to locals once instead of rebuilding them per timepoint
+    na_values = ["n/a"] * len(cols_to_include)
 
-    for fsid, base, ses in timepoints:
-        if skip_set and base in skip_set:
+    for fsid, base, ses, tp in timepoints:
+        if base in skip_set:
             continue
         r = find_row(base, ses)
         if r is None:
@@ -781,31 +986,23 @@ def build_qdec_rows(
                     f"No participants.tsv row found for subject {base} session {ses!r}"
                 )
             # fill NA values when not strict
-            values = ["n/a" for _ in cols_to_include]
+            values = list(na_values)
         else:
-            values = [r.get(c, "n/a") for c in cols_to_include]
+            values = get_values(r)
 
         if sex_col_idx is not None:
-            sex_value = values[sex_col_idx]
-            norm_sex = str(sex_value).strip().lower() if sex_value is not None else None
-            if norm_sex is None or norm_sex in missing_tokens:
+            if values[sex_col_idx].strip().lower() in missing_tokens:
                 skipped_missing_sex.append(fsid)
                 continue
 
-        tp = session_to_tp(ses)
         tp_str = str(tp) if tp is not None else "n/a"
-        rows.append([fsid, base, tp_str] + values)
+        decorated.append(
+            (base, tp if tp is not None else sys.maxsize, fsid, [fsid, base, tp_str] + values)
+        )
 
     # sort by base, then numeric tp if possible
-    def sort_key(row: List[str]):
-        base = row[1]
-        try:
-            tp_val = int(row[2])
-        except Exception:
-            tp_val = 10**9
-        return (base, tp_val, row[0])
-
-    rows.sort(key=sort_key)
+    decorated.sort()
+    rows = [d[3] for d in decorated]
     if skipped_missing_sex:
         limit = 10
         sample = ", ".join(skipped_missing_sex[:limit])
@@ -828,27 +1025,33 @@ def scan_bids_subjects(bids_root: Path) -> Tuple[Set[str], Set[Tuple[str, str]]]
     if not bids_root.is_dir():
         raise NotADirectoryError(f"BIDS root is not a directory: {bids_root}")
 
-    subs: Set[str] = set()
-    sess: Set[Tuple[str, str]] = set()
-    for child in bids_root.iterdir():
-        if not child.is_dir() or not child.name.startswith("sub-"):
-            continue
-        sub = child.name
-        subs.add(sub)
+    def _scan_subject(sub_path: str) -> List[Tuple[str, str]]:
         # look for ses-* under subject
-        for sesdir in child.iterdir():
-            if sesdir.is_dir() and sesdir.name.startswith("ses-"):
-                sess.add((sub, sesdir.name))
+        sub = os.path.basename(sub_path)
+        with os.scandir(sub_path) as it:
+            return [(sub, e.name) for e in it if e.name.startswith("ses-") and e.is_dir()]
+
+    with os.scandir(bids_root) as it:
+        subject_dirs = [e.path for e in it if e.name.startswith("sub-") and e.is_dir()]
+
+    subs: Set[str] = {os.path.basename(p) for p in subject_dirs}
+    sess: Set[Tuple[str, str]] = set()
+    if subject_dirs:
+        # Directory listing releases the GIL; scan subjects concurrently (helps on NFS)
+        with ThreadPoolExecutor(max_workers=min(16, len(subject_dirs))) as ex:
+            for pairs in ex.map(_scan_subject, subject_dirs):
+                sess.update(pairs)
     return subs, sess
 
 
 def summarize_consistency(
     bids_root: Optional[Path],
     subjects_dir: Path,
-    participants_rows: List[Dict[str, str]],
+    participants_rows: List[Tuple[str, ...]],
+    col_index: Dict[str, int],
     participant_col: str,
     session_col: Optional[str],
-    timepoints: List[Tuple[str, str, Optional[str]]],
+    timepoints: List[Tuple[str, str, Optional[str], Optional[int]]],
 ) -> None:
     """Print a summary comparing participants.tsv, subjects_dir, and optional BIDS tree.
 
@@ -858,101 +1061,185 @@ def summarize_consistency(
       - subjects present in subjects_dir but missing in participants.tsv
       - if BIDS is provided: subjects/sessions present in BIDS but missing elsewhere
     """
+    limit = getattr(sys.modules[__name__], "_LIST_LIMIT", 20)
+
     # Participants sets
-    parts_subjects: Set[str] = set(
-        r.get(participant_col, "") for r in participants_rows if r.get(participant_col)
-    )
+    sub_pos = col_index.get(participant_col)
+    ses_pos = col_index.get(session_col) if session_col else None
+    parts_subjects: Set[str] = set()
     parts_pairs: Set[Tuple[str, str]] = set()
-    if session_col:
+    if sub_pos is not None:
+        add_subject = parts_subjects.add
+        add_pair = parts_pairs.add
         for r in participants_rows:
-            sub = r.get(participant_col)
-            ses = r.get(session_col)
-            if sub and ses:
-                parts_pairs.add((sub, ses))
+            sub = r[sub_pos]
+            if not sub:
+                continue
+            add_subject(sub)
+            if ses_pos is not None and (ses := r[ses_pos]):
+                add_pair((sub, ses))
 
     # Subjects_dir sets
     sd_subjects: Set[str] = set()
     sd_pairs: Set[Tuple[str, str]] = set()
-    for fsid, base, ses in timepoints:
+    for fsid, base, ses, _tp in timepoints:
         sd_subjects.add(base)
         if ses:
             sd_pairs.add((base, ses))
 
-    print("=== Qdec/Subjects summary ===")
-    print(f"subjects_dir: {subjects_dir}")
-    print(f"participants.tsv subjects: {len(parts_subjects)}")
-    print(f"subjects_dir subjects (with any timepoints): {len(sd_subjects)}")
-    print(f"subjects_dir timepoints: {len(timepoints)}")
+    bids_subjects: Set[str] = set()
+    if bids_root:
+        bids_subjects, bids_pairs = scan_bids_subjects(bids_root)
 
-    only_in_participants = sorted(parts_subjects - sd_subjects)
-    only_in_subjects_dir = sorted(sd_subjects - parts_subjects)
+    # Classify every subject once by where it was found (participants/subjects_dir/BIDS bits)
+    # instead of computing one set difference per report.
+    in_parts, in_sd, in_bids = 4, 2, 1
+    buckets: Dict[int, List[str]] = defaultdict(list)
+    for sub in parts_subjects | sd_subjects | bids_subjects:
+        mask = (
+            (in_parts if sub in parts_subjects else 0)
+            | (in_sd if sub in sd_subjects else 0)
+            | (in_bids if sub in bids_subjects else 0)
+        )
+        buckets[mask].append(sub)
+
+    def _select(present: int, absent: int) -> List[str]:
+        return sorted(
+            s
+            for mask, subs in buckets.items()
+            if mask & present and not mask & absent
+            for s in subs
+        )
+
+    # Collect the report and emit it with one write (keeps it contiguous in batch logs)
+    out: List[str] = []
+    out.append("=== Qdec/Subjects summary ===")
+    out.append(f"subjects_dir: {subjects_dir}")
+    out.append(f"participants.tsv subjects: {len(parts_subjects)}")
+    out.append(f"subjects_dir subjects (with any timepoints): {len(sd_subjects)}")
+    out.append(f"subjects_dir timepoints: {len(timepoints)}")
+
+    only_in_participants = _select(in_parts, in_sd)
+    only_in_subjects_dir = _select(in_sd, in_parts)
     if only_in_participants:
-        print(
+        out.append(
             f"Subjects in participants.tsv but missing in subjects_dir: {len(only_in_participants)}"
         )
-        limit = getattr(sys.modules[__name__], "_LIST_LIMIT", 20)
-        print(
+        out.append(
             ", ".join(only_in_participants[:limit])
             + (" ..." if len(only_in_participants) > limit else "")
         )
     if only_in_subjects_dir:
-        print(
+        out.append(
             f"Subjects in subjects_dir but missing in participants.tsv: {len(only_in_subjects_dir)}"
         )
-        limit = getattr(sys.modules[__name__], "_LIST_LIMIT", 20)
-        print(
+        out.append(
             ", ".join(only_in_subjects_dir[:limit])
             + (" ..." if len(only_in_subjects_dir) > limit else "")
         )
 
     if bids_root:
-        bids_subjects, bids_pairs = scan_bids_subjects(bids_root)
-        print(f"BIDS subjects: {len(bids_subjects)}")
-        missing_in_sd = sorted(bids_subjects - sd_subjects)
-        missing_in_parts = sorted(bids_subjects - parts_subjects)
-        limit = getattr(sys.modules[__name__], "_LIST_LIMIT", 20)
+        out.append(f"BIDS subjects: {len(bids_subjects)}")
+        missing_in_sd = _select(in_bids, in_sd)
+        missing_in_parts = _select(in_bids, in_parts)
         if missing_in_sd:
-            print(f"BIDS subjects missing in subjects_dir: {len(missing_in_sd)}")
+            out.append(f"BIDS subjects missing in subjects_dir: {len(missing_in_sd)}")
             if missing_in_sd != only_in_participants:
-                print(
+                out.append(
                     ", ".join(missing_in_sd[:limit])
                     + (" ..." if len(missing_in_sd) > limit else "")
                 )
         if missing_in_parts:
-            print(f"BIDS subjects missing in participants.tsv: {len(missing_in_parts)}")
+            out.append(f"BIDS subjects missing in participants.tsv: {len(missing_in_parts)}")
             if missing_in_parts != only_in_subjects_dir:
-                print(
+                out.append(
                     ", ".join(missing_in_parts[:limit])
                     + (" ..." if len(missing_in_parts) > limit else "")
                 )
 
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def _load_qdec(qdec_path: Path) -> Tuple[List[str], List[List[str]]]:
+    """Read a QDEC table and return (header, data_rows); both are empty for an empty file."""
+    with qdec_path.open("r", newline="") as fh:
+        rows = list(csv.reader(fh, dialect=csv.excel_tab))
+    return (rows[0], rows[1:]) if rows else ([], [])
+
+
+def _qdec_column(header: List[str], rows: List[List[str]], name: str) -> List[str]:
+    """Return the non-empty values of column name (empty if the column is absent)."""
+    try:
+        idx = header.index(name)
+    except ValueError:
+        return []
+    return [row[idx] for row in rows if len(row) > idx and row[idx]]
+
 
 def write_qdec(output_path: Path, header: List[str], rows: List[List[str]]) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="") as f:
+    with output_path.open("w", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f, dialect=csv.excel_tab)
         writer.writerow(header)
-        for row in rows:
-            writer.writerow(row)
+        writer.writerows(rows)
+
+
+def _write_tsv(path: Path, header: List[str], rows) -> None:
+    """Format a tab-separated table in memory and write it with a single write call."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, dialect=csv.excel_tab)
+    writer.writerow(header)
+    writer.writerows(rows)
+    with path.open("w", newline="") as fh:
+        fh.write(buf.getvalue())
+
+
+def _list_names(path) -> Set[str]:
+    """Return the entry names of directory path, or an empty set if it cannot be read."""
+    try:
+        with os.scandir(path) as it:
+            return {e.name for e in it}
+    except OSError:
+        return set()
+
+
+def batch_list_dirs(paths: List[Path], max_workers: int = 32) -> Dict[Path, Set[str]]:
+    """List many directories concurrently; unreadable ones map to an empty set.
+
+    os.scandir releases the GIL, so a thread pool overlaps the round-trips on network
+    filesystems where serial directory reads dominate.
+    """
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as ex:
+        return dict(zip(paths, ex.map(_list_names, paths)))
 
 
 def _ensure_symlink(
-    link_path: Path, target_path: Path, dry_run: bool = True, force: bool = False
+    link_path: Path, target_abs: str, dry_run: bool = True, force: bool = False
 ) -> Tuple[bool, str]:
-    """Ensure link_path is a symlink to target_path.
+    """Ensure link_path is a symlink to target_abs.
+
+    target_abs is an absolute, already resolved path string prepared by the caller; an
+    existing link is then checked with a single lstat + readlink instead of resolving both
+    paths.
 
     Returns (changed, message)
     - changed True if a new symlink was created or updated.
     - message contains a short description of the action taken or why it was skipped.
     """
+    try:
+        st: Optional[os.stat_result] = os.lstat(link_path)
+    except FileNotFoundError:
+        st = None
     # If link exists and is a symlink
-    if link_path.is_symlink():
-        try:
-            current = link_path.resolve()
-        except FileNotFoundError:
-            current = None
-        if current and current == target_path.resolve():
-            return False, f"exists (correct symlink): {link_path} -> {target_path}"
+    if st is not None and stat.S_ISLNK(st.st_mode):
+        current = os.readlink(link_path)
+        if not os.path.isabs(current):
+            current = os.path.normpath(os.path.join(os.path.dirname(link_path), current))
+        # Fall back to full resolution only when the literal link text differs
+        if current == target_abs or os.path.realpath(link_path) == os.path.realpath(target_abs):
+            return False, f"exists (correct symlink): {link_path} -> {target_abs}"
         if not force:
             return (
                 False,
@@ -960,32 +1247,36 @@ def _ensure_symlink(
             )
         if not dry_run:
             link_path.unlink()
-            link_path.symlink_to(target_path, target_is_directory=True)
-        return True, f"updated symlink: {link_path} -> {target_path}"
+            os.symlink(target_abs, link_path, target_is_directory=True)
+        return True, f"updated symlink: {link_path} -> {target_abs}"
     # If link path exists but is not a symlink, do not touch
-    if link_path.exists():
+    if st is not None:
         return False, f"exists (not a symlink, skipping): {link_path}"
     # Create new
     if not dry_run:
-        link_path.symlink_to(target_path, target_is_directory=True)
-    return True, f"created symlink: {link_path} -> {target_path}"
+        os.symlink(target_abs, link_path, target_is_directory=True)
+    return True, f"created symlink: {link_path} -> {target_abs}"
 
 
 def verify_and_link_long(
     subjects_dir: Path,
-    timepoints: List[Tuple[str, str, Optional[str]]],
+    timepoints: List[Tuple[str, str, Optional[str], Optional[int]]],
     link: bool = False,
     dry_run: bool = True,
     force: bool = False,
     require_stats: bool = True,
+    ignore_symlink_targets: bool = False,
 ) -> None:
     """Verify presence of .long directories and optionally create symlinks.
 
-    For each timepoint (fsid, base, ses):
+    For each timepoint (fsid, base, ses, tp):
       - expected long dir: <fsid>.long.<base>
       - if missing, and stats exist in <fsid>/stats/aseg.stats, optionally create a symlink
         <fsid>.long.<base> -> <fsid>
 
+    With ignore_symlink_targets, an existing <fsid>.long.<base> symlink counts as present
+    without resolving (stat-ing) its target.
+
     Prints a short summary at the end.
     """
     created = 0
@@ -994,6 +1285,34 @@ def verify_and_link_long(
     missing_stats: List[str] = []
     present = 0
 
+    # Evidence of a completed run, by file name within stats/ and surf/
+    evidence_stats_names = {"aseg.stats"}
+    evidence_surf_names = set()
+    for hemi in ("lh", "rh"):
+        # aparc variants
+        for parc in ("aparc.DKTatlas.mapped", "aparc", "aparc.a2009s"):
+            evidence_stats_names.add(f"{hemi}.{parc}.stats")
+        # surface measures
+        evidence_surf_names.add(f"{hemi}.thickness")
+
+    # List subjects_dir once; per-timepoint checks are then dict lookups, and DirEntry
+    # answers is_dir/is_symlink from the directory listing for everything but symlinks
+    try:
+        with os.scandir(subjects_dir) as it:
+            existing: Dict[str, os.DirEntry] = {e.name: e for e in it}
+    except OSError:
+        existing = {}
+
+    def _is_dir(entry: Optional[os.DirEntry]) -> bool:
+        if entry is None:
+            return False
+        if ignore_symlink_targets and entry.is_symlink():
+            # trust the link and assume its target exists
+            return True
+        return entry.is_dir()
+
+    stats_listing: Dict[str, Set[str]] = {}
+
     def has_any_evidence(tp_dir: Path) -> bool:
         """Return True if tp_dir shows evidence of a completed run.
 
@@ -1001,31 +1320,28 @@ def verify_and_link_long(
           - stats/aseg.stats
           - stats/<hemi>.aparc*.stats (classic or DKT mapped)
           - surf/<hemi>.thickness (surface measures exist)
+
+        Reads stats/ (and surf/ only if needed) once instead of probing each file.
         """
-        stats_dir = tp_dir / "stats"
-        surf_dir = tp_dir / "surf"
-        if (stats_dir / "aseg.stats").exists():
+        if tp_dir.name not in existing:
+            stats_listing[tp_dir.name] = set()
+            return False
+        entries = stats_listing[tp_dir.name] = _list_names(tp_dir / "stats")
+        if not evidence_stats_names.isdisjoint(entries):
             return True
-        for hemi in ("lh", "rh"):
-            # aparc variants
-            for parc in ("aparc.DKTatlas.mapped", "aparc", "aparc.a2009s"):
-                if (stats_dir / f"{hemi}.{parc}.stats").exists():
-                    return True
-            # surface measures
-            if (surf_dir / f"{hemi}.thickness").exists():
-                return True
-        return False
+        return not evidence_surf_names.isdisjoint(_list_names(tp_dir / "surf"))
+
+    # Resolve once; symlink targets are then absolute and compared without further lookups
+    subjects_dir_abs = str(subjects_dir.resolve())
 
-    for fsid, base, ses in timepoints:
+    for fsid, base, ses, _tp in timepoints:
         if ".long." in fsid:
             skipped += 1
             print(f"skipping: {fsid} (already a .long entry)")
             continue
         tp_dir = subjects_dir / fsid
         long_dir = subjects_dir / f"{fsid}.long.{base}"
-        stats_path = tp_dir / "stats" / "aseg.stats"
-
-        if long_dir.exists() and long_dir.is_dir():
+        if _is_dir(existing.get(long_dir.name)):
             present += 1
             continue
 
@@ -1036,7 +1352,19 @@ def verify_and_link_long(
             continue
 
         if link:
-            changed, msg = _ensure_symlink(long_dir, tp_dir, dry_run=dry_run, force=force)
+            target_abs = os.path.join(subjects_dir_abs, fsid)
+            msg = ""
+            if long_dir.name not in existing:
+                # Known missing from the listing: create directly without precondition probes
+                try:
+                    if not dry_run:
+                        os.symlink(target_abs, long_dir, target_is_directory=True)
+                    msg = f"created symlink: {long_dir} -> {target_abs}"
+                except FileExistsError:
+                    # appeared since the listing; fall back to the full check below
+                    pass
+            if not msg:
+                _changed, msg = _ensure_symlink(long_dir, target_abs, dry_run=dry_run, force=force)
             if "created" in msg:
                 created += 1
             elif "updated" in msg:
@@ -1045,7 +1373,11 @@ def verify_and_link_long(
                 skipped += 1
             print(msg)
         else:
-            note_missing = " [NO-EVIDENCE]" if require_stats and not stats_path.exists() else ""
+            note_missing = (
+                " [NO-EVIDENCE]"
+                if require_stats and "aseg.stats" not in stats_listing.get(fsid, ())
+                else ""
+            )
             print(f"would link: {long_dir} -> {tp_dir} (use --link-long to create){note_missing}")
             skipped += 1
 
@@ -1055,12 +1387,143 @@ def verify_and_link_long(
     if missing_stats:
         print(f"Timepoints missing stats/aseg.stats in {subjects_dir}: {len(missing_stats)}")
         limit = getattr(sys.modules[__name__], "_LIST_LIMIT", 20)
-        sample = ", ".join(sorted(missing_stats)[:limit])
+        sample = ", ".join(heapq.nsmallest(limit, missing_stats))
         print(sample + (" ..." if len(missing_stats) > limit else ""))
 
 
+def aseg_table_path(qdec_path: Path, study_type: str) -> Path:
+    """Output table written by run_asegstats2table."""
+    name = "aseg.long.table" if study_type == "longitudinal" else "aseg.table"
+    return qdec_path.parent / name
+
+
+def aparc_table_path(qdec_path: Path, hemi: str, parc: str, meas: str, study_type: str) -> Path:
+    """Output table written by run_aparcstats2table for one (hemi, parc, meas)."""
+    suffix = "long.table" if study_type == "longitudinal" else "table"
+    return qdec_path.parent / "aparc_tables" / f"{hemi}.{parc}.{meas}.{suffix}"
+
+
+def surf_output_paths(
+    out_root: Path, pairs: Sequence[Tuple[str, str]], smooth_kernels: Sequence[int]
+) -> List[Path]:
+    """Files run_surf_mass_univariate writes per (hemi, meas): the mris_preproc output and
+    one smoothed copy per kernel."""
+    return [
+        out_root / f"{hemi}.{meas}{suffix}.mgh"
+        for hemi, meas in pairs
+        for suffix in ("", *(f"_sm{k}" for k in smooth_kernels))
+    ]
+
+
+def stage_input_files(
+    subjects_dir: Path,
+    subjects: Sequence[str],
+    rel_paths: Sequence[str],
+) -> List[str]:
+    """Files a stage reads: <subjects_dir>/<subject>/<rel> for every subject and rel path."""
+    root = os.fspath(subjects_dir)
+    return [os.path.join(root, subj, rel) for subj in subjects for rel in rel_paths]
+
+
+def stat_inputs(inputs: Sequence) -> List[Tuple[str, Optional[int]]]:
+    """(path, st_mtime_ns) for every input, with None for inputs that do not exist.
+
+    Each input is stat'ed once; the result feeds both _stage_key and outputs_up_to_date.
+    """
+    stamps: List[Tuple[str, Optional[int]]] = []
+    for p in inputs:
+        try:
+            stamps.append((os.fspath(p), os.stat(p).st_mtime_ns))
+        except OSError:
+            stamps.append((os.fspath(p), None))
+    return stamps
+
+
+def outputs_up_to_date(
+    outputs: Sequence[Path], input_stamps: Sequence[Tuple[str, Optional[int]]]
+) -> bool:
+    """Return True if every output exists and is not older than any existing input.
+
+    input_stamps come from stat_inputs(). Missing inputs are ignored (the tools skip
+    subjects without them); when no input exists at all, nothing is considered up to date.
+    """
+    newest_input = max((ns for _p, ns in input_stamps if ns is not None), default=None)
+    if newest_input is None:
+        return False
+    for out in outputs:
+        try:
+            if os.stat(out).st_mtime_ns < newest_input:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+# Per-output-root record of completed stages, used to skip unchanged stages on re-runs
+STAGE_MANIFEST_NAME = ".prep_long_cache.json"
+
+
+def stage_manifest_path(qdec_path: Path) -> Path:
+    """Stage manifest kept next to the QDEC and the stage outputs."""
+    return qdec_path.parent / STAGE_MANIFEST_NAME
+
+
+def load_stage_manifest(path: Path) -> Dict[str, dict]:
+    """Read the stage manifest; a missing or unreadable manifest is treated as empty."""
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def qdec_digest(header: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
+    """Content hash of a parsed QDEC; unlike its mtime, unchanged by rewriting the same table."""
+    h = hashlib.blake2b(digest_size=16)
+    for row in (header, *rows):
+        h.update("\t".join(row).encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _stage_key(
+    stage: str, input_stamps: Sequence[Tuple[str, Optional[int]]], args_subset: Tuple
+) -> str:
+    """Hash of the stage name, its relevant arguments and its inputs' stat_inputs() stamps."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((stage, list(input_stamps), args_subset)).encode())
+    return h.hexdigest()
+
+
+def _stage_cached(
+    manifest: Dict[str, dict], stage: str, key: Optional[str], outputs: Sequence[Path]
+) -> bool:
+    """True if stage last succeeded with the same key and every expected output still exists."""
+    entry = manifest.get(stage)
+    if key is None or not isinstance(entry, dict):
+        return False
+    if entry.get("rc") != 0 or entry.get("args_hash") != key:
+        return False
+    return all(os.path.isfile(out) for out in outputs)
+
+
+def record_stages(path: Path, results: Dict[str, Tuple[str, int]]) -> None:
+    """Merge {stage: (key, rc)} into the manifest at path and replace it atomically."""
+    manifest = load_stage_manifest(path)
+    now = time.time()
+    for stage, (key, rc) in results.items():
+        manifest[stage] = {"mtime": now, "rc": rc, "args_hash": key}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(json.dumps(manifest, indent=2).encode())
+    os.replace(tmp, path)
+
+
 def run_asegstats2table(
-    qdec_path: Path, subjects_dir: Path, study_type: str = "longitudinal"
+    qdec_path: Path,
+    subjects_dir: Path,
+    study_type: str = "longitudinal",
+    qdec_header: Optional[List[str]] = None,
+    qdec_rows: Optional[List[List[str]]] = None,
 ) -> int:
     """Run asegstats2table with SUBJECTS_DIR pointing to subjects_dir.
 
@@ -1068,9 +1531,10 @@ def run_asegstats2table(
         qdec_path: Path to Qdec file
         subjects_dir: Path to subjects directory
         study_type: 'cross-sectional' or 'longitudinal' - determines command flags
+        qdec_header, qdec_rows: Already parsed QDEC content; read from qdec_path if omitted
     """
 
-    aseg_bin = shutil.which("asegstats2table")
+    aseg_bin = _which("asegstats2table")
     if not aseg_bin:
         print(
             "asegstats2table not found in PATH. Source FreeSurfer before using --aseg.",
@@ -1079,15 +1543,11 @@ def run_asegstats2table(
         return 4
 
     # Output filename depends on study type
-    if study_type == "longitudinal":
-        aseg_out = qdec_path.parent / "aseg.long.table"
-    else:
-        aseg_out = qdec_path.parent / "aseg.table"
+    aseg_out = aseg_table_path(qdec_path, study_type)
 
     aseg_out.parent.mkdir(parents=True, exist_ok=True)
 
-    env = os.environ.copy()
-    env["SUBJECTS_DIR"] = str(subjects_dir.resolve())
+    env = _fs_env(subjects_dir)
 
     # Build command based on study type
     if study_type == "longitudinal":
@@ -1103,10 +1563,9 @@ def run_asegstats2table(
     else:
         # Cross-sectional: need to extract subject IDs from Qdec
         try:
-            with qdec_path.open("r", newline="") as f:
-                reader = csv.DictReader(f, dialect=csv.excel_tab)
-                rows = list(reader)
-                subjects = [row["fsid"] for row in rows if row.get("fsid")]
+            if qdec_header is None or qdec_rows is None:
+                qdec_header, qdec_rows = _load_qdec(qdec_path)
+            subjects = _qdec_column(qdec_header, qdec_rows, "fsid")
         except Exception as e:
             print(f"ERROR: Could not read subjects from Qdec: {e}", file=sys.stderr)
             return 5
@@ -1125,9 +1584,10 @@ def run_asegstats2table(
     )
 
     try:
-        subprocess.run(cmd, check=True, env=env, capture_output=True, text=True)
+        # Only stderr is needed (on failure); stdout streams through like the other tools
+        subprocess.run(cmd, check=True, env=env, stderr=subprocess.PIPE)
     except subprocess.CalledProcessError as exc:
-        error_output = exc.stderr or exc.stdout or ""
+        error_output = exc.stderr.decode("utf-8", "replace") if exc.stderr else ""
         if study_type == "longitudinal" and (
             "IndexError: list index out of range" in error_output
             or "list index out of range" in error_output
@@ -1152,17 +1612,31 @@ def run_asegstats2table(
     return 0
 
 
+def _auto_link_long(subjects_dir: Path) -> None:
+    """Create missing .long symlinks so mris_preproc can resolve <fsid>.long.<base> paths."""
+    try:
+        tps = scan_subjects_dir(subjects_dir)
+        verify_and_link_long(
+            subjects_dir, tps, link=True, dry_run=False, force=False, require_stats=False
+        )
+    except Exception as e:
+        logger.warning(f"Failed to auto-link .long symlinks before surface prep: {e}")
+
+
 def run_surf_mass_univariate(
     qdec_path: Path,
     subjects_dir: Path,
     target: str,
-    measures: List[str],
-    hemis: List[str],
-    smooth_kernels: List[int],
+    measures: Sequence[str],
+    hemis: Sequence[str],
+    smooth_kernels: Sequence[int],
     outdir: Optional[Path] = None,
     force: bool = False,
     dry_run: bool = False,
     study_type: str = "longitudinal",
+    qdec_header: Optional[List[str]] = None,
+    qdec_rows: Optional[List[List[str]]] = None,
+    link_long: bool = True,
 ) -> int:
     """Prepare mass-univariate surface data using mris_preproc and mri_surf2surf.
 
@@ -1173,27 +1647,25 @@ def run_surf_mass_univariate(
 
     Args:
         study_type: Either 'longitudinal' (with .long dirs) or 'cross-sectional'
+        qdec_header, qdec_rows: Already parsed QDEC content; read from qdec_path if omitted
+        link_long: Create missing .long symlinks first (main() links before starting stages)
     """
-    mris_preproc_bin = shutil.which("mris_preproc")
-    surf2surf_bin = shutil.which("mri_surf2surf")
+    mris_preproc_bin = _which("mris_preproc")
+    surf2surf_bin = _which("mri_surf2surf")
     if not mris_preproc_bin or not surf2surf_bin:
         missing = [
             n
             for n, b in [("mris_preproc", mris_preproc_bin), ("mri_surf2surf", surf2surf_bin)]
             if not b
         ]
-        print(
-            f"[WARN] Missing FreeSurfer binaries: {', '.join(missing)}. Skipping surface prep.",
-            file=sys.stderr,
-        )
+        logger.warning(f"Missing FreeSurfer binaries: {', '.join(missing)}. Skipping surface prep.")
         return 8
 
     # Verify target surface template exists under subjects_dir (eg, subjects_dir/fsaverage)
     target_dir = subjects_dir / str(target)
-    if not target_dir.exists() or not target_dir.is_dir():
-        print(
-            f"[WARN] Surface target '{target}' not found under {subjects_dir}. Expected directory: {target_dir}. Skipping surface prep.",
-            file=sys.stderr,
+    if not os.path.isdir(target_dir):
+        logger.warning(
+            f"Surface target '{target}' not found under {subjects_dir}. Expected directory: {target_dir}. Skipping surface prep."
         )
         return 0
 
@@ -1201,25 +1673,44 @@ def run_surf_mass_univariate(
     # If forcing, we may remove existing files per pair; otherwise just ensure dir exists
     out_root.mkdir(parents=True, exist_ok=True)
 
-    env = os.environ.copy()
-    env["SUBJECTS_DIR"] = str(subjects_dir.resolve())
+    env = _fs_env(subjects_dir)
 
     # Ensure .long symlinks exist so that mris_preproc can resolve <fsid>.long.<base> paths
     # Only applicable for longitudinal studies
     # Skip auto-linking if in dry-run mode
-    if study_type == "longitudinal" and not dry_run:
-        try:
-            tps = scan_subjects_dir(subjects_dir)
-            verify_and_link_long(
-                subjects_dir, tps, link=True, dry_run=False, force=False, require_stats=False
-            )
-        except Exception as e:
-            print(
-                f"[WARN] Failed to auto-link .long symlinks before surface prep: {e}",
-                file=sys.stderr,
-            )
+    if study_type == "longitudinal" and not dry_run and link_long:
+        _auto_link_long(subjects_dir)
     elif study_type == "longitudinal" and dry_run:
-        print("[INFO] Skipping automatic .long symlink creation due to dry-run mode.")
+        logger.info("Skipping automatic .long symlink creation due to dry-run mode.")
+
+    # Use the parsed QDEC (read once) and list every surf/ dir once;
+    # each (hemi, meas) pair below is then a pure set-membership filter
+    if qdec_header is None or qdec_rows is None:
+        qdec_header, qdec_rows = _load_qdec(qdec_path)
+    header = qdec_header
+    # Expect at least fsid and fsid-base
+    try:
+        fsid_idx = header.index("fsid")
+        base_idx = header.index("fsid-base")
+    except ValueError:
+        fsid_idx = base_idx = -1
+    body: List[List[str]] = []
+    surf_listing: Dict[Tuple[str, str], Set[str]] = {}
+    # Negative cache: pairs whose .long dir is absent or whose surf/ is empty/unreadable;
+    # they are dropped for every (hemi, meas) without listing or name checks
+    negative_surf_dirs: FrozenSet[Tuple[str, str]] = frozenset()
+    if fsid_idx >= 0:
+        min_len = max(fsid_idx, base_idx) + 1
+        body = [row for row in qdec_rows if len(row) >= min_len]
+        pairs = list(dict.fromkeys((row[fsid_idx], row[base_idx]) for row in body))
+        # One listing of subjects_dir spares a failing scandir per absent .long dir
+        present_names = _list_names(subjects_dir)
+        long_names = {pair: f"{pair[0]}.long.{pair[1]}" for pair in pairs}
+        listed = [pair for pair in pairs if long_names[pair] in present_names]
+        surf_dirs = [subjects_dir / long_names[pair] / "surf" for pair in listed]
+        listing = batch_list_dirs(surf_dirs)
+        surf_listing = {pair: names for pair, d in zip(listed, surf_dirs) if (names := listing[d])}
+        negative_surf_dirs = frozenset(pairs).difference(surf_listing)
 
     # Helper: filter QDEC rows for which the surf measure exists; return filtered qdec path
     def build_filtered_qdec_for(
@@ -1230,55 +1721,42 @@ def run_surf_mass_univariate(
         Returns (qdec_filtered_path, kept_count, dropped_count, dropped_pairs[(fsid, base)]).
         If no rows are dropped, returns the original qdec_path.
         """
-        kept_rows: List[List[str]] = []
-        dropped = 0
-        dropped_pairs: List[Tuple[str, str]] = []
-        # Read QDEC (tab-separated) as generic CSV
-        with qdec_path.open("r", newline="") as fh:
-            reader = csv.reader(fh, dialect=csv.excel_tab)
-            rows = list(reader)
-        if not rows:
+        if not header:
             return qdec_path, 0, 0, []
-        header = rows[0]
-        # Expect at least fsid and fsid-base
-        try:
-            fsid_idx = header.index("fsid")
-            base_idx = header.index("fsid-base")
-        except ValueError:
+        if fsid_idx < 0:
             # Unexpected format; fallback to original
-            return qdec_path, len(rows) - 1, 0, []
-        for row in rows[1:]:
-            if not row or len(row) <= max(fsid_idx, base_idx):
-                continue
-            fsid = row[fsid_idx]
-            base = row[base_idx]
-            link_dir = subjects_dir / f"{fsid}.long.{base}"
-            surf_file = link_dir / "surf" / f"{hemi}.{meas}"
-            if surf_file.exists():
-                kept_rows.append(row)
-            else:
-                dropped += 1
-                dropped_pairs.append((fsid, base))
+            return qdec_path, len(qdec_rows), 0, []
+        surf_name = f"{hemi}.{meas}"
+        missing = negative_surf_dirs.union(
+            pair for pair, names in surf_listing.items() if surf_name not in names
+        )
         # If nothing dropped, reuse original QDEC
-        if dropped == 0:
-            return qdec_path, len(kept_rows), 0, []
+        if not missing:
+            return qdec_path, len(body), 0, []
+        dropped_pairs = [
+            pair for pair in ((row[fsid_idx], row[base_idx]) for row in body) if pair in missing
+        ]
+        dropped = len(dropped_pairs)
+        kept = len(body) - dropped
         # If everything dropped, skip gracefully by returning a path with no rows
         # but we'll detect 0 kept later and skip the computation
         filt_path = qdec_path.parent / f"qdec.{hemi}.{meas}.filtered.dat"
-        with filt_path.open("w", newline="") as fh:
-            writer = csv.writer(fh, dialect=csv.excel_tab)
-            writer.writerow(header)
-            for r in kept_rows:
-                writer.writerow(r)
-        print(
-            f"[INFO] Filtered QDEC for {hemi}/{meas}: kept={len(kept_rows)}, dropped={dropped} -> {filt_path}"
+        _write_tsv(
+            filt_path,
+            header,
+            (row for row in body if (row[fsid_idx], row[base_idx]) not in missing),
         )
-        return filt_path, len(kept_rows), dropped, dropped_pairs
+        logger.info(
+            f"Filtered QDEC for {hemi}/{meas}: kept={kept}, dropped={dropped} -> {filt_path}"
+        )
+        return filt_path, kept, dropped, dropped_pairs
 
     # QC summary rows
     qc_rows: List[List[str]] = [
         ["hemi", "measure", "kept", "dropped", "filtered_qdec", "missing_list"]
     ]
+    # Commands per (hemi, meas), run after planning: (hemi, meas, pre_path, cmd1, smooth_cmds)
+    pair_jobs: List[Tuple[str, str, Path, List[str], List[Tuple[int, Path, List[str]]]]] = []
 
     for hemi in hemis:
         for meas in measures:
@@ -1286,42 +1764,39 @@ def run_surf_mass_univariate(
             # If not forcing and file exists, we still rebuild base pre_path to reflect kept set.
             if force:
                 try:
-                    if pre_path.exists():
-                        pre_path.unlink()
+                    pre_path.unlink(missing_ok=True)
                 except Exception:
                     pass
             # Build filtered QDEC (drop rows missing the required surf file)
             qdec_for_pair, kept, dropped, dropped_pairs = build_filtered_qdec_for(hemi, meas)
+            # Plain strings for the command lines and QC rows, converted once per pair
+            qdec_arg = os.fspath(qdec_for_pair)
+            pre_arg = os.fspath(pre_path)
             if kept == 0:
-                print(
-                    f"[WARN] Skipping surface prep for {hemi}/{meas}: no subjects with existing surf files.",
-                    file=sys.stderr,
+                logger.warning(
+                    f"Skipping surface prep for {hemi}/{meas}: no subjects with existing surf files."
                 )
                 # record QC row with zero kept
-                qc_rows.append([hemi, meas, str(kept), str(dropped), str(qdec_for_pair), ""])
+                qc_rows.append([hemi, meas, str(kept), str(dropped), qdec_arg, ""])
                 continue
 
             # Write missing list if any dropped
             missing_path = ""
             if dropped > 0:
                 miss_file = out_root / f"{hemi}.{meas}.missing.tsv"
-                if force and miss_file.exists():
+                if force:
                     try:
-                        miss_file.unlink()
+                        miss_file.unlink(missing_ok=True)
                     except Exception:
                         pass
-                with miss_file.open("w", newline="") as fh:
-                    w = csv.writer(fh, dialect=csv.excel_tab)
-                    w.writerow(["fsid", "fsid-base"])  # header
-                    for fsid, base in dropped_pairs:
-                        w.writerow([fsid, base])
+                _write_tsv(miss_file, ["fsid", "fsid-base"], dropped_pairs)
                 missing_path = str(miss_file)
 
             # mris_preproc
             cmd1 = [
                 mris_preproc_bin,
                 "--qdec-long",
-                str(qdec_for_pair),
+                qdec_arg,
                 "--target",
                 target,
                 "--hemi",
@@ -1329,26 +1804,18 @@ def run_surf_mass_univariate(
                 "--meas",
                 meas,
                 "--out",
-                str(pre_path),
+                pre_arg,
             ]
             print(f"Running: {' '.join(cmd1)} (with SUBJECTS_DIR={env['SUBJECTS_DIR']})")
-            if not dry_run:
-                try:
-                    subprocess.run(cmd1, check=True, env=env)
-                except subprocess.CalledProcessError as exc:
-                    print(
-                        f"mris_preproc failed (hemi={hemi}, meas={meas}) with code {exc.returncode}",
-                        file=sys.stderr,
-                    )
-                    return exc.returncode or 9
-            else:
+            if dry_run:
                 print("[DRY-RUN] Would execute mris_preproc command above")
             # mri_surf2surf smoothing for each kernel
+            smooth_cmds: List[Tuple[int, Path, List[str]]] = []
             for fwhm in smooth_kernels:
                 sm_path = out_root / f"{hemi}.{meas}_sm{fwhm}.mgh"
-                if force and sm_path.exists():
+                if force:
                     try:
-                        sm_path.unlink()
+                        sm_path.unlink(missing_ok=True)
                     except Exception:
                         pass
                 cmd2 = [
@@ -1358,7 +1825,7 @@ def run_surf_mass_univariate(
                     "--s",
                     target,
                     "--sval",
-                    str(pre_path),
+                    pre_arg,
                     "--tval",
                     str(sm_path),
                     "--fwhm-trg",
@@ -1367,46 +1834,80 @@ def run_surf_mass_univariate(
                     "--noreshape",
                 ]
                 print(f"Running: {' '.join(cmd2)} (with SUBJECTS_DIR={env['SUBJECTS_DIR']})")
-                if not dry_run:
-                    try:
-                        subprocess.run(cmd2, check=True, env=env)
-                    except subprocess.CalledProcessError as exc:
-                        print(
-                            f"mri_surf2surf failed (hemi={hemi}, meas={meas}, fwhm={fwhm}) with code {exc.returncode}",
-                            file=sys.stderr,
-                        )
-                        return exc.returncode or 10
-                    print(f"Wrote: {pre_path}\nWrote: {sm_path}")
-                else:
+                if dry_run:
                     print("[DRY-RUN] Would execute mri_surf2surf command above")
                     print(f"[DRY-RUN] Would write: {pre_path}")
                     print(f"[DRY-RUN] Would write: {sm_path}")
+                smooth_cmds.append((fwhm, sm_path, cmd2))
+            if not dry_run:
+                pair_jobs.append((hemi, meas, pre_path, cmd1, smooth_cmds))
 
             # record QC summary
-            qc_rows.append([hemi, meas, str(kept), str(dropped), str(qdec_for_pair), missing_path])
+            qc_rows.append([hemi, meas, str(kept), str(dropped), qdec_arg, missing_path])
+
+    def run_pair(
+        hemi: str,
+        meas: str,
+        pre_path: Path,
+        cmd1: List[str],
+        smooth_cmds: List[Tuple[int, Path, List[str]]],
+    ) -> Tuple[int, List[str]]:
+        """Run mris_preproc, then mri_surf2surf per kernel; return (rc, messages)."""
+        try:
+            subprocess.run(cmd1, check=True, env=env)
+        except subprocess.CalledProcessError as exc:
+            return exc.returncode or 9, [
+                f"mris_preproc failed (hemi={hemi}, meas={meas}) with code {exc.returncode}"
+            ]
+        wrote: List[str] = []
+        for fwhm, sm_path, cmd2 in smooth_cmds:
+            try:
+                subprocess.run(cmd2, check=True, env=env)
+            except subprocess.CalledProcessError as exc:
+                return exc.returncode or 10, wrote + [
+                    f"mri_surf2surf failed (hemi={hemi}, meas={meas}, fwhm={fwhm}) with code {exc.returncode}"
+                ]
+            wrote.append(f"Wrote: {pre_path}\nWrote: {sm_path}")
+        return 0, wrote
+
+    # (hemi, meas) pairs are independent: run their mris_preproc -> mri_surf2surf chains
+    # concurrently, bounded by the CPU count as the FreeSurfer tools are CPU-bound themselves
+    if pair_jobs:
+        with ThreadPoolExecutor(max_workers=min(len(pair_jobs), os.cpu_count() or 1)) as ex:
+            results = list(ex.map(lambda job: run_pair(*job), pair_jobs))
+        first_rc = 0
+        for rc, messages in results:
+            if rc == 0:
+                print("\n".join(messages))
+                continue
+            # the last message is the failure; earlier ones are outputs written before it
+            if messages[:-1]:
+                print("\n".join(messages[:-1]))
+            print(messages[-1], file=sys.stderr)
+            first_rc = first_rc or rc
+        if first_rc:
+            return first_rc
+
     # Write QC summary TSV
     try:
         qc_path = out_root / "qc_summary.tsv"
-        if force and qc_path.exists():
+        if force:
             try:
-                qc_path.unlink()
+                qc_path.unlink(missing_ok=True)
             except Exception:
                 pass
         if not dry_run:
-            with qc_path.open("w", newline="") as fh:
-                w = csv.writer(fh, dialect=csv.excel_tab)
-                for r in qc_rows:
-                    w.writerow(r)
+            _write_tsv(qc_path, qc_rows[0], qc_rows[1:])
             print(f"Wrote surface QC summary: {qc_path}")
         else:
             print(f"[DRY-RUN] Would write surface QC summary: {qc_path}")
     except Exception as e:
-        print(f"[WARN] Failed to write surface QC summary: {e}", file=sys.stderr)
+        logger.warning(f"Failed to write surface QC summary: {e}")
 
     return 0
 
 
-def run_fsqc(
+def start_fsqc(
     qdec_path: Path,
     subjects_dir: Path,
     outdir: Optional[Path] = None,
@@ -1419,14 +1920,18 @@ def run_fsqc(
     html: bool = False,
     skip_existing: bool = False,
     force: bool = False,
-) -> int:
-    """Run fsqc via run_fsqc CLI if available.
+    qdec_header: Optional[List[str]] = None,
+    qdec_rows: Optional[List[List[str]]] = None,
+) -> Optional[subprocess.Popen]:
+    """Launch fsqc via run_fsqc CLI (if available) without waiting for it.
 
     Selects subjects from the QDEC table (fsid or fsid-base). If pick_from=base, we pass unique fsid-base.
-    Returns 0 on success or when fsqc is unavailable.
+    The QDEC is read from qdec_path unless qdec_header/qdec_rows are already given.
+    Returns the running process, or None when fsqc is unavailable or there is nothing to check.
+    Pair with finish_fsqc() to collect the result.
     """
     # Try to find run_fsqc command
-    fsqc_bin = shutil.which("run_fsqc")
+    fsqc_bin = _which("run_fsqc")
     if not fsqc_bin:
         # If run_fsqc not in PATH, check if fsqc module is available and try to run it via python -m
         try:
@@ -1435,42 +1940,34 @@ def run_fsqc(
             # Use python -m fsqc instead of run_fsqc command
             fsqc_command = [sys.executable, "-m", "fsqc"]
         except ImportError:
-            print(
-                "[WARN] fsqc not found (run_fsqc command or Python module). Skipping --qc step. Install with: bash scripts/install.sh",
-                file=sys.stderr,
+            logger.warning(
+                "fsqc not found (run_fsqc command or Python module). Skipping --qc step. Install with: bash scripts/install.sh"
             )
-            return 0
+            return None
     else:
         fsqc_command = [fsqc_bin]
 
     out_root = outdir if outdir is not None else (qdec_path.parent / "fsqc")
     out_root.mkdir(parents=True, exist_ok=True)
 
-    # parse QDEC and collect ids
-    with qdec_path.open("r", newline="") as fh:
-        reader = csv.reader(fh, dialect=csv.excel_tab)
-        rows = list(reader)
-    if not rows:
-        print("[WARN] QDEC empty; skipping fsqc", file=sys.stderr)
-        return 0
-    header = rows[0]
+    # parse QDEC (unless already parsed) and collect ids
+    if qdec_header is None or qdec_rows is None:
+        qdec_header, qdec_rows = _load_qdec(qdec_path)
+    if not qdec_header:
+        logger.warning("QDEC empty; skipping fsqc")
+        return None
+    header = qdec_header
     id_col = "fsid" if pick_from == "fsid" else "fsid-base"
     try:
         idx = header.index(id_col)
     except ValueError:
-        print(f"[WARN] Column '{id_col}' not found in QDEC; skipping fsqc", file=sys.stderr)
-        return 0
-    values = [r[idx] for r in rows[1:] if len(r) > idx and r[idx]]
+        logger.warning(f"Column '{id_col}' not found in QDEC; skipping fsqc")
+        return None
     # de-duplicate, preserve order
-    seen = set()
-    subjects = []
-    for v in values:
-        if v not in seen:
-            seen.add(v)
-            subjects.append(v)
+    subjects = list(dict.fromkeys(r[idx] for r in qdec_rows if len(r) > idx and r[idx]))
     if not subjects:
-        print("[WARN] No subjects found to run fsqc on; skipping", file=sys.stderr)
-        return 0
+        logger.warning("No subjects found to run fsqc on; skipping")
+        return None
 
     # Detect headless environment (no DISPLAY) and auto-disable surfaces to avoid OpenGL/GLFW errors
     try:
@@ -1479,10 +1976,7 @@ def run_fsqc(
     except Exception:
         headless = True
     if surfaces and headless:
-        print(
-            "[INFO] No DISPLAY detected; disabling fsqc surfaces module to avoid OpenGL errors.",
-            file=sys.stderr,
-        )
+        logger.info("No DISPLAY detected; disabling fsqc surfaces module to avoid OpenGL errors.")
         surfaces = False
 
     cmd = fsqc_command + [
@@ -1512,21 +2006,82 @@ def run_fsqc(
     if skip_existing and not force:
         cmd.append("--skip-existing")
 
-    env = os.environ.copy()
-    env["SUBJECTS_DIR"] = str(subjects_dir.resolve())
+    env = _fs_env(subjects_dir)
     print(f"Running fsqc: {' '.join(cmd)}")
-    try:
-        subprocess.run(cmd, check=True, env=env)
-        print(f"Wrote fsqc outputs to: {out_root}")
-    except subprocess.CalledProcessError as exc:
-        print(
-            f"[WARN] fsqc failed with exit code {exc.returncode}; continuing. Command: {' '.join(cmd)}",
-            file=sys.stderr,
-        )
+    return subprocess.Popen(cmd, env=env)
+
+
+def finish_fsqc(proc: Optional[subprocess.Popen], out_root: Path) -> int:
+    """Wait for an fsqc process started by start_fsqc() and report its outcome.
+
+    Returns the fsqc exit code (0 when nothing was started); failures are logged.
+    """
+    if proc is None:
         return 0
+    rc = proc.wait()
+    if rc != 0:
+        logger.warning(f"fsqc failed with exit code {rc}. Command: {' '.join(proc.args)}")
+        return rc
+    print(f"Wrote fsqc outputs to: {out_root}")
     return 0
 
 
+def aparc_candidate_parcs(parc: str) -> List[str]:
+    """Parcellations tried for aparc tables, in order of preference."""
+    candidate_parcs = [parc]
+    for alt in ("aparc.DKTatlas.mapped", "aparc", "aparc.a2009s"):
+        if parc != alt:
+            candidate_parcs.append(alt)
+    return candidate_parcs
+
+
+def detect_aparc_parc(
+    subjects_dir: Path, parc: str, hemis: Sequence[str], study_type: str
+) -> Optional[str]:
+    """First of aparc_candidate_parcs(parc) with stats files under subjects_dir, or None."""
+    candidate_parcs = aparc_candidate_parcs(parc)
+    # Map every candidate stats file name to its parcellation's priority (lower wins), then
+    # list each subject's stats/ once and intersect (instead of a recursive glob per
+    # candidate and hemi); stop early once the requested parcellation is found
+    want_long = study_type == "longitudinal"
+    candidate_rank = {
+        f"{hemi}.{p}.stats": rank for rank, p in enumerate(candidate_parcs) for hemi in hemis
+    }
+    try:
+        with os.scandir(subjects_dir) as it:
+            subj_paths = [
+                e.path for e in it if (not want_long or ".long." in e.name) and e.is_dir()
+            ]
+    except OSError:
+        subj_paths = []
+    best_rank = len(candidate_parcs)
+    for subj_path in subj_paths:
+        try:
+            names = os.listdir(os.path.join(subj_path, "stats"))
+        except OSError:
+            continue
+        best_rank = min((candidate_rank.get(n, best_rank) for n in names), default=best_rank)
+        if best_rank == 0:
+            break
+    return candidate_parcs[best_rank] if best_rank < len(candidate_parcs) else None
+
+
+def _detected_aparc_parc(
+    subjects_dir: Path, parc: str, hemis: Sequence[str], study_type: str
+) -> Optional[str]:
+    """detect_aparc_parc(), logging a fallback to another parc or the absence of stats."""
+    chosen_parc = detect_aparc_parc(subjects_dir, parc, hemis, study_type)
+    if not chosen_parc:
+        logger.warning(
+            f"No aparc stats files found for any of parcs {aparc_candidate_parcs(parc)} and hemis={hemis} under {subjects_dir}. Skipping aparc tables."
+        )
+    elif chosen_parc != parc:
+        logger.info(
+            f"Using detected parcellation '{chosen_parc}' for aparc tables (requested '{parc}')."
+        )
+    return chosen_parc
+
+
 def run_aparcstats2table(
     qdec_path: Path,
     subjects_dir: Path,
@@ -1534,6 +2089,10 @@ def run_aparcstats2table(
     measures: Optional[List[str]] = None,
     hemis: Optional[List[str]] = None,
     study_type: str = "longitudinal",
+    qdec_header: Optional[List[str]] = None,
+    qdec_rows: Optional[List[List[str]]] = None,
+    detect_parc: bool = True,
+    max_workers: Optional[int] = None,
 ) -> int:
     """Run aparcstats2table for cross-sectional or longitudinal studies.
 
@@ -1544,10 +2103,15 @@ def run_aparcstats2table(
         measures: List of measures (thickness, area, volume)
         hemis: List of hemispheres (lh, rh)
         study_type: 'cross-sectional' or 'longitudinal'
+        qdec_header, qdec_rows: Already parsed QDEC content; read from qdec_path if omitted
+        detect_parc: Look under subjects_dir for the parcellation to use; False to take parc
+            as already detected (main() passes the result of its own detect_aparc_parc call)
+        max_workers: Concurrent aparcstats2table calls (default: CPU count); main() passes
+            --jobs so the calls do not oversubscribe the node next to the other stages
 
     Returns 0 on success, non-zero on first failure.
     """
-    aparc_bin = shutil.which("aparcstats2table")
+    aparc_bin = _which("aparcstats2table")
     if not aparc_bin:
         print(
             "aparcstats2table not found in PATH. Source FreeSurfer before using --aparc.",
@@ -1563,64 +2127,36 @@ def run_aparcstats2table(
     out_root = qdec_path.parent / "aparc_tables"
     out_root.mkdir(parents=True, exist_ok=True)
 
-    env = os.environ.copy()
-    env["SUBJECTS_DIR"] = str(subjects_dir.resolve())
+    env = _fs_env(subjects_dir)
 
     # Preflight: auto-detect available parcellation stats
-    candidate_parcs = [parc]
-    if parc != "aparc.DKTatlas.mapped":
-        candidate_parcs.append("aparc.DKTatlas.mapped")
-    if parc != "aparc":
-        candidate_parcs.append("aparc")
-    if parc != "aparc.a2009s":
-        candidate_parcs.append("aparc.a2009s")
-
-    chosen_parc: Optional[str] = None
-    for p in candidate_parcs:
-        found = False
-        for hemi in hemis:
-            if study_type == "longitudinal":
-                pattern = f"**/*.long.*/stats/{hemi}.{p}.stats"
-            else:
-                pattern = f"**/stats/{hemi}.{p}.stats"
-            if list(subjects_dir.glob(pattern)):
-                found = True
-                break
-        if found:
-            chosen_parc = p
-            break
-
-    if not chosen_parc:
-        print(
-            f"[WARN] No aparc stats files found for any of parcs {candidate_parcs} and hemis={hemis} under {subjects_dir}. Skipping aparc tables."
-        )
-        return 0
-    if chosen_parc != parc:
-        print(
-            f"[INFO] Using detected parcellation '{chosen_parc}' for aparc tables (requested '{parc}')."
-        )
-    parc = chosen_parc
+    if detect_parc:
+        chosen_parc = _detected_aparc_parc(subjects_dir, parc, hemis, study_type)
+        if not chosen_parc:
+            return 0
+        parc = chosen_parc
 
     # Get subject list for cross-sectional mode
     subjects = []
     if study_type == "cross-sectional":
         try:
-            with qdec_path.open("r", newline="") as f:
-                reader = csv.DictReader(f, dialect=csv.excel_tab)
-                rows = list(reader)
-                subjects = [row["fsid"] for row in rows if row.get("fsid")]
+            if qdec_header is None or qdec_rows is None:
+                qdec_header, qdec_rows = _load_qdec(qdec_path)
+            subjects = _qdec_column(qdec_header, qdec_rows, "fsid")
         except Exception as e:
             print(f"ERROR: Could not read subjects from Qdec: {e}", file=sys.stderr)
             return 7
 
+    qdec_arg = os.fspath(qdec_path)
+    jobs: List[Tuple[List[str], Path]] = []
     for hemi in hemis:
         for meas in measures:
             if study_type == "longitudinal":
-                out_path = out_root / f"{hemi}.{parc}.{meas}.long.table"
+                out_path = aparc_table_path(qdec_path, hemi, parc, meas, study_type)
                 cmd = [
                     aparc_bin,
                     "--qdec-long",
-                    str(qdec_path),
+                    qdec_arg,
                     "--hemi",
                     hemi,
                     "--meas",
@@ -1632,7 +2168,7 @@ def run_aparcstats2table(
                     "--skip",
                 ]
             else:
-                out_path = out_root / f"{hemi}.{parc}.{meas}.table"
+                out_path = aparc_table_path(qdec_path, hemi, parc, meas, study_type)
                 cmd = (
                     [aparc_bin, "--subjects"]
                     + subjects
@@ -1651,16 +2187,107 @@ def run_aparcstats2table(
             print(
                 f"Running: {' '.join(cmd[:10])}{'...' if len(cmd) > 10 else ''} (with SUBJECTS_DIR={env['SUBJECTS_DIR']})"
             )
-            try:
-                subprocess.run(cmd, check=True, env=env)
-            except subprocess.CalledProcessError as exc:
-                print(
-                    f"aparcstats2table failed with exit code {exc.returncode}. Command: {' '.join(cmd[:10])}...",
-                    file=sys.stderr,
-                )
-                return exc.returncode or 7
+            jobs.append((cmd, out_path))
+
+    def run_table(cmd: List[str]) -> int:
+        try:
+            subprocess.run(cmd, check=True, env=env)
+        except subprocess.CalledProcessError as exc:
+            return exc.returncode or 7
+        return 0
+
+    # Every (hemi, meas) table already covers all subjects in one call; the calls are
+    # independent of each other, so overlap them instead of running them one by one
+    workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        rcs = list(ex.map(run_table, [cmd for cmd, _out in jobs]))
+    first_rc = 0
+    for (cmd, out_path), rc in zip(jobs, rcs):
+        if rc == 0:
             print(f"Wrote aparcstats2table output: {out_path}")
-    return 0
+            continue
+        print(
+            f"aparcstats2table failed with exit code {rc}. Command: {' '.join(cmd[:10])}...",
+            file=sys.stderr,
+        )
+        first_rc = first_rc or rc
+    return first_rc
+
+
+# Name of the stage the current thread runs (set by _run_stage) and its unfinished lines
+_stage_output = threading.local()
+# Serializes the lines written by concurrent stages
+_output_lock = threading.Lock()
+
+
+class _StageStream(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that prefixes lines written by stage threads.
+
+    Complete lines are written and flushed at once, tagged with the stage name, so they
+    keep their order relative to the output of the tools the stage runs.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+
+    def write(self, s: str) -> int:
+        name = getattr(_stage_output, "name", None)
+        if name is None:
+            with _output_lock:
+                self._stream.write(s)
+            return len(s)
+        pending = _stage_output.pending
+        *lines, pending[id(self)] = (pending.pop(id(self), "") + s).split("\n")
+        if lines:
+            with _output_lock:
+                self._stream.write("".join(f"[{name}] {line}\n" for line in lines))
+                self._stream.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        with _output_lock:
+            self._stream.flush()
+
+    def flush_pending(self) -> None:
+        """Write out the current thread's unterminated line, if any."""
+        if getattr(_stage_output, "name", None) is not None and _stage_output.pending.get(id(self)):
+            self.write("\n")
+
+
+@contextlib.contextmanager
+def _prefix_stage_output():
+    """Route stdout/stderr (and the logging handlers on them) through _StageStream.
+
+    Threads that run _run_stage() get their lines prefixed with the stage name; all other
+    threads write through unchanged.
+    """
+    out, err = sys.stdout, sys.stderr
+    proxies = {id(out): _StageStream(out), id(err): _StageStream(err)}
+    handlers = [
+        h
+        for h in logging.getLogger().handlers
+        if isinstance(h, logging.StreamHandler) and id(h.stream) in proxies
+    ]
+    previous = [h.setStream(proxies[id(h.stream)]) for h in handlers]
+    sys.stdout, sys.stderr = proxies[id(out)], proxies[id(err)]
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = out, err
+        for h, stream in zip(handlers, previous):
+            h.setStream(stream)
+
+
+def _run_stage(name: str, fn: Callable[[], int]) -> int:
+    """Run fn with the current thread's output tagged as belonging to stage name."""
+    _stage_output.name, _stage_output.pending = name, {}
+    try:
+        return fn()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            if isinstance(stream, _StageStream):
+                stream.flush_pending()
+        _stage_output.name = None
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -1672,6 +2299,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         return 0
 
     args = parse_args(argv)
+    # Stage warnings/notes go through the module logger; no-op if the caller configured logging
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
     # If user requested nohup, re-launch the same command under nohup and exit.
     # Avoid infinite re-spawn by setting ANALYSE_QDEC_NOHUP=1 in the child's env.
@@ -1697,7 +2326,7 @@ def main(argv: Optional[List[str]] = None) -> int:
 
         cmd = ["nohup", sys.executable, str(Path(__file__).resolve())] + filtered
 
-        print(f"[INFO] Relaunching under nohup. Log: {log_file}")
+        logger.info(f"Relaunching under nohup. Log: {log_file}")
         # Open log file for append (creates it)
         try:
             lf = open(str(log_file), "a")
@@ -1713,8 +2342,10 @@ def main(argv: Optional[List[str]] = None) -> int:
             if lf is not None:
                 p = subprocess.Popen(cmd, stdout=lf, stderr=subprocess.STDOUT, env=env)
             else:
-                p = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
-            print(f"[INFO] analyse_qdec.py started under nohup (PID={p.pid}).")
+                p = subprocess.Popen(
+                    cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+                )
+            logger.info(f"analyse_qdec.py started under nohup (PID={p.pid}).")
             # Print machine-readable JSON line
             try:
                 print(json.dumps({"pid": p.pid, "log": str(log_file)}))
@@ -1727,21 +2358,25 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Parent exits successfully
         return 0
 
-    # Early dependency check
-    missing_deps = check_dependencies(args)
-    if missing_deps:
-        print("ERROR: Missing required dependencies:", file=sys.stderr)
-        for dep in missing_deps:
-            print(f"  - {dep}", file=sys.stderr)
-        print(
-            "\nPlease install missing dependencies and ensure FreeSurfer is properly sourced.",
-            file=sys.stderr,
-        )
-        return 1
+    # Early dependency check; tool availability is probed once and reused by the stages.
+    # Without any optional stage there is nothing to probe (QDEC-only / link-only runs).
+    stages_requested = bool(args.aseg or args.aparc or args.surf or args.qc)
+    if stages_requested:
+        tools = probe_tools()
+        missing_deps = check_dependencies(args, tools)
+        if missing_deps:
+            print("ERROR: Missing required dependencies:", file=sys.stderr)
+            for dep in missing_deps:
+                print(f"  - {dep}", file=sys.stderr)
+            print(
+                "\nPlease install missing dependencies and ensure FreeSurfer is properly sourced.",
+                file=sys.stderr,
+            )
+            return 1
 
     # Subjects directory check
     subj_dir: Path = args.subjects_dir
-    if not subj_dir.exists() or not subj_dir.is_dir():
+    if not os.path.isdir(subj_dir):
         print(f"ERROR: subjects_dir not found or not a directory: {subj_dir}", file=sys.stderr)
         return 2
 
@@ -1756,16 +2391,16 @@ def main(argv: Optional[List[str]] = None) -> int:
             print(f"ERROR: Qdec file not found: {args.qdec}", file=sys.stderr)
             return 2
         out_path = args.qdec
-        print(f"[INFO] Analyzing existing Qdec file: {out_path}")
+        logger.info(f"Analyzing existing Qdec file: {out_path}")
 
         # Auto-detect study type from Qdec if set to auto
         if args.type == "auto":
             detected_type = detect_qdec_type(out_path)
-            print(f"[INFO] Detected study type: {detected_type}")
+            logger.info(f"Detected study type: {detected_type}")
             study_type = detected_type
         else:
             study_type = args.type
-            print(f"[INFO] Using specified study type: {study_type}")
+            logger.info(f"Using specified study type: {study_type}")
         # Parse the provided QDEC to obtain header, rows, and timepoints for downstream checks
         header = []
         rows = []
@@ -1793,7 +2428,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 base = r[base_idx]
                 m = SUBJECT_DIR_PATTERN.match(fsid)
                 ses = m.group("ses") if m else None
-                timepoints.append((fsid, base, ses))
+                timepoints.append((fsid, base, ses, session_to_tp(ses)))
 
             # Pilot sampling: if requested, select the first N unique bases and
             # keep only rows/timepoints for those bases. Write sampled QDEC under
@@ -1803,7 +2438,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 n = int(args.pilot) if args.pilot else 3
                 sample_bases: List[str] = []
                 seen: Set[str] = set()
-                for _, base, _ in timepoints:
+                for _, base, _, _ in timepoints:
                     if base not in seen:
                         seen.add(base)
                         sample_bases.append(base)
@@ -1811,7 +2446,10 @@ def main(argv: Optional[List[str]] = None) -> int:
                         break
 
                 if not sample_bases:
-                    print(f"ERROR: Pilot requested but no subject bases found in QDEC {out_path}", file=sys.stderr)
+                    print(
+                        f"ERROR: Pilot requested but no subject bases found in QDEC {out_path}",
+                        file=sys.stderr,
+                    )
                     return 2
 
                 # Decide where to write pilot QDEC: prefer explicit --output, else same dir as provided QDEC
@@ -1833,7 +2471,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                     writer = csv.writer(fh, dialect=csv.excel_tab)
                     for r in sampled_rows:
                         writer.writerow(r)
-                print(f"[INFO] Wrote pilot QDEC ({n} bases) to: {pilot_path}")
+                logger.info(f"Wrote pilot QDEC ({n} bases) to: {pilot_path}")
 
                 # Replace rows/timepoints with sampled versions for downstream steps
                 rows = sampled_rows[1:]
@@ -1849,6 +2487,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         bases: Set[str] = set(tp[1] for tp in timepoints) if timepoints else set()
         # Placeholder participants data (used by summarize_consistency). Empty list is OK.
         participants_rows = []
+        col_index: Dict[str, int] = {}
         participant_col = "participant_id"
         session_col = "session_id"
     else:
@@ -1865,13 +2504,16 @@ def main(argv: Optional[List[str]] = None) -> int:
             print(f"ERROR: participants.tsv not found: {args.participants}", file=sys.stderr)
             return 2
 
-        print(
-            "[INFO] Generating Qdec from participants.tsv (consider using generate_qdec.py for more control)"
+        logger.info(
+            "Generating Qdec from participants.tsv (consider using generate_qdec.py for more control)"
         )
 
         # Generate Qdec file
-        fieldnames, participants_rows, participant_col, session_col = read_participants(
-            args.participants, args.participant_column, args.session_column
+        fieldnames, participants_rows, col_index, participant_col, session_col = read_participants(
+            args.participants,
+            args.participant_column,
+            args.session_column,
+            include_columns=args.include_columns,
         )
         if args.inspect:
             print("participants.tsv columns:")
@@ -1881,8 +2523,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 
         timepoints = scan_subjects_dir(subj_dir)
         bases: Set[str] = set(tp[1] for tp in timepoints)
-        print(
-            f"[INFO] Subjects overview: bases={len(bases)}, timepoints={len(timepoints)} in {subj_dir}"
+        logger.info(
+            f"Subjects overview: bases={len(bases)}, timepoints={len(timepoints)} in {subj_dir}"
         )
 
         # Build skip set from CLI options
@@ -1900,19 +2542,20 @@ def main(argv: Optional[List[str]] = None) -> int:
                         if tok and not tok.startswith("#"):
                             skip_set.add(tok)
             except Exception as e:
-                print(f"[WARN] Failed reading --skip-file {args.skip_file}: {e}", file=sys.stderr)
+                logger.warning(f"Failed reading --skip-file {args.skip_file}: {e}")
 
         header, rows = build_qdec_rows(
             timepoints,
             participants_rows,
+            col_index,
             participant_col,
             session_col,
             args.include_columns,
             args.strict,
-            skip_set=skip_set or None,
+            skip_set=frozenset(skip_set),
         )
         if skip_set:
-            print(f"[INFO] Skipped subjects (fsid-base) provided: {len(skip_set)}")
+            logger.info(f"Skipped subjects (fsid-base) provided: {len(skip_set)}")
 
         # set list limit globally for summary printing
         setattr(sys.modules[__name__], "_LIST_LIMIT", max(0, int(args.list_limit)))
@@ -1929,7 +2572,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 # Backwards-compat: user provided a file path
                 out_path = out_root
                 out_root = out_path.parent if out_path.parent != Path("") else Path(".")
-                print(f"[INFO] --output looks like a file; will write QDEC to: {out_path}")
+                logger.info(f"--output looks like a file; will write QDEC to: {out_path}")
                 if not prepare_output_directory(out_root, args.force):
                     print("ERROR: Output directory preparation cancelled by user.", file=sys.stderr)
                     return 1
@@ -1939,9 +2582,9 @@ def main(argv: Optional[List[str]] = None) -> int:
                     print("ERROR: Output directory preparation cancelled by user.", file=sys.stderr)
                     return 1
                 out_path = out_root / qdec_filename
-                print(f"[INFO] Output root: {out_root} (QDEC: {out_path})")
+                logger.info(f"Output root: {out_root} (QDEC: {out_path})")
         except Exception as e:
-            print(f"[WARN] Could not determine output type: {e}", file=sys.stderr)
+            logger.warning(f"Could not determine output type: {e}")
             out_path = out_root / qdec_filename
 
         write_qdec(out_path, header, rows)
@@ -1950,16 +2593,22 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Consistency summary if bids provided
         if args.bids:
             summarize_consistency(
-                args.bids, subj_dir, participants_rows, participant_col, session_col, timepoints
+                args.bids,
+                subj_dir,
+                participants_rows,
+                col_index,
+                participant_col,
+                session_col,
+                timepoints,
             )
 
         # Auto-detect study type from generated Qdec
         if args.type == "auto":
             study_type = detect_qdec_type(out_path)
-            print(f"[INFO] Detected study type: {study_type}")
+            logger.info(f"Detected study type: {study_type}")
         else:
             study_type = args.type
-            print(f"[INFO] Using specified study type: {study_type}")
+            logger.info(f"Using specified study type: {study_type}")
 
     # From here on, both workflows converge: we have out_path (Qdec file) and study_type
     print(f"\n{'='*60}")
@@ -1978,7 +2627,9 @@ def main(argv: Optional[List[str]] = None) -> int:
                 return 1
             # Keep out_path pointing to the provided QDEC file (absolute)
             out_path = out_path.resolve()
-            print(f"[INFO] Using provided QDEC: {out_path}; outputs will be written under: {out_root}")
+            logger.info(
+                f"Using provided QDEC: {out_path}; outputs will be written under: {out_root}"
+            )
         else:
             out_root = args.output
             is_file_like = any(
@@ -1988,7 +2639,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 # Backwards-compat: user provided a file path
                 out_path = out_root
                 out_root = out_path.parent if out_path.parent != Path("") else Path(".")
-                print(f"[INFO] --output looks like a file; will write QDEC to: {out_path}")
+                logger.info(f"--output looks like a file; will write QDEC to: {out_path}")
                 # Ensure parent directory exists
                 if not prepare_output_directory(out_root, args.force):
                     print("ERROR: Output directory preparation cancelled by user.", file=sys.stderr)
@@ -1999,7 +2650,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                     print("ERROR: Output directory preparation cancelled by user.", file=sys.stderr)
                     return 1
                 out_path = out_root / qdec_filename
-                print(f"[INFO] Output root: {out_root} (QDEC: {out_path})")
+                logger.info(f"Output root: {out_root} (QDEC: {out_path})")
     except Exception as e:
         print(f"ERROR: Failed to prepare output directory: {e}", file=sys.stderr)
         return 1
@@ -2012,12 +2663,20 @@ def main(argv: Optional[List[str]] = None) -> int:
         qdec_bases = set(tp[1] for tp in timepoints) if timepoints else set()
 
         if not sd_timepoints:
-            print(f"ERROR: No timepoint directories found under subjects_dir={subj_dir}.", file=sys.stderr)
-            print("Ensure your FastSurfer/FreeSurfer outputs are present (sub-*_ses-* directories).", file=sys.stderr)
+            print(
+                f"ERROR: No timepoint directories found under subjects_dir={subj_dir}.",
+                file=sys.stderr,
+            )
+            print(
+                "Ensure your FastSurfer/FreeSurfer outputs are present (sub-*_ses-* directories).",
+                file=sys.stderr,
+            )
             return 2
 
         if not qdec_bases:
-            print(f"ERROR: No subject bases could be extracted from QDEC {out_path}.", file=sys.stderr)
+            print(
+                f"ERROR: No subject bases could be extracted from QDEC {out_path}.", file=sys.stderr
+            )
             return 2
 
         matched = qdec_bases & sd_bases
@@ -2026,7 +2685,10 @@ def main(argv: Optional[List[str]] = None) -> int:
                 f"ERROR: None of the QDEC subject bases ({len(qdec_bases)}) were found under subjects_dir={subj_dir}.",
                 file=sys.stderr,
             )
-            print("Check that --subjects-dir points to the FastSurfer/FreeSurfer derivatives directory containing sub-*_ses-* folders.", file=sys.stderr)
+            print(
+                "Check that --subjects-dir points to the FastSurfer/FreeSurfer derivatives directory containing sub-*_ses-* folders.",
+                file=sys.stderr,
+            )
             return 2
 
         overlap = len(matched) / float(len(qdec_bases)) if qdec_bases else 0.0
@@ -2035,12 +2697,14 @@ def main(argv: Optional[List[str]] = None) -> int:
             missing = sorted(list(qdec_bases - matched))
             sample = ", ".join(missing[:10])
             more = " ..." if len(missing) > 10 else ""
-            print(
-                f"[WARN] Low overlap between QDEC ({len(qdec_bases)} bases) and subjects_dir ({len(sd_bases)} bases): {overlap:.1%} matched.",
-                file=sys.stderr,
+            logger.warning(
+                f"Low overlap between QDEC ({len(qdec_bases)} bases) and subjects_dir ({len(sd_bases)} bases): {overlap:.1%} matched."
+            )
+            logger.warning(f"Examples of QDEC bases missing from subjects_dir: {sample}{more}")
+            logger.warning(
+                "If this is expected (you only want to analyze a small subset), proceed; "
+                "otherwise check paths and QDEC content."
             )
-            print(f"Examples of QDEC bases missing from subjects_dir: {sample}{more}", file=sys.stderr)
-            print("If this is expected (you only want to analyze a small subset), proceed; otherwise check paths and QDEC content.", file=sys.stderr)
 
         # Quick check: can we write into out_root?
         try:
@@ -2053,7 +2717,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             print(f"ERROR: Cannot write to output directory {out_root}: {e}", file=sys.stderr)
             return 1
     except Exception as e:
-        print(f"[WARN] Preflight checks failed: {e}", file=sys.stderr)
+        logger.warning(f"Preflight checks failed: {e}")
 
     # Only write QDEC when we generated it here (i.e., not when user provided --qdec)
     if not qdec_provided:
@@ -2067,7 +2731,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         _headless = True
     qc_surfaces_effective = bool(getattr(args, "qc_surfaces", False))
     if bool(getattr(args, "qc", False)) and qc_surfaces_effective and _headless:
-        print("[INFO] No DISPLAY detected; fsqc surfaces will be disabled.", file=sys.stderr)
+        logger.info("No DISPLAY detected; fsqc surfaces will be disabled.")
         qc_surfaces_effective = False
     # Save effective configuration for transparency/reproducibility
     try:
@@ -2080,12 +2744,15 @@ def main(argv: Optional[List[str]] = None) -> int:
             "include_columns": args.include_columns,
             "strict": bool(args.strict),
             "force": bool(args.force),
+            "jobs": int(args.jobs),
+            "fail_fast": bool(args.fail_fast),
             "bids": str(args.bids) if args.bids else None,
             "list_limit": int(args.list_limit),
             "verify_long": bool(args.verify_long),
             "link_long": bool(args.link_long),
             "link_dry_run": bool(args.link_dry_run),
             "link_force": bool(args.link_force),
+            "ignore_symlink_targets": bool(args.ignore_symlink_targets),
             "aseg": bool(args.aseg),
             "aparc": bool(args.aparc),
             "aparc_parc": args.aparc_parc,
@@ -2095,11 +2762,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             "surf_target": args.surf_target,
             "surf_measures": args.surf_measures,
             "surf_hemis": args.surf_hemis,
-            "smooth": (
-                _coerce_int_list(getattr(args, "smooth", None)) or [int(args.surf_fwhm)]
-                if hasattr(args, "surf_fwhm")
-                else None
-            ),
+            "smooth": args.smooth,
             "surf_outdir": str(args.surf_outdir) if args.surf_outdir else None,
             "qc": bool(args.qc),
             "qc_output": str(args.qc_output) if args.qc_output else None,
@@ -2119,19 +2782,31 @@ def main(argv: Optional[List[str]] = None) -> int:
             },
             "pilot": {
                 "enabled": bool(getattr(args, "pilot", None) is not None),
-                "size": int(getattr(args, "pilot", None)) if getattr(args, "pilot", None) is not None else None,
-                "sample_qdec": str(pilot_path) if 'pilot_path' in locals() and pilot_path is not None else None,
+                "size": (
+                    int(getattr(args, "pilot", None))
+                    if getattr(args, "pilot", None) is not None
+                    else None
+                ),
+                "sample_qdec": (
+                    str(pilot_path) if "pilot_path" in locals() and pilot_path is not None else None
+                ),
             },
         }
         cfg_out = out_root / "prep_long.effective.json"
-        with cfg_out.open("w") as fh:
-            json.dump(eff_cfg, fh, indent=2, sort_keys=True)
+        # Serialize in memory and write once
+        cfg_out.write_bytes(json.dumps(eff_cfg, indent=2, sort_keys=True).encode("utf-8"))
         print(f"Wrote effective config: {cfg_out}")
     except Exception as e:
-        print(f"[WARN] Failed to write effective config JSON: {e}", file=sys.stderr)
+        logger.warning(f"Failed to write effective config JSON: {e}")
     # Optional consistency summary
     summarize_consistency(
-        args.bids, subj_dir, participants_rows, participant_col, session_col, timepoints
+        args.bids,
+        subj_dir,
+        participants_rows,
+        col_index,
+        participant_col,
+        session_col,
+        timepoints,
     )
     # Optional FastSurfer .long symlink verification/creation for FreeSurfer tools compatibility
     # Only applicable for longitudinal studies
@@ -2142,103 +2817,276 @@ def main(argv: Optional[List[str]] = None) -> int:
             link=args.link_long,
             dry_run=args.link_dry_run,
             force=args.link_force,
+            ignore_symlink_targets=args.ignore_symlink_targets,
         )
     elif study_type == "cross-sectional" and (args.verify_long or args.link_long):
-        print(
-            "[INFO] Skipping .long symlink verification (not applicable for cross-sectional studies)."
+        logger.info(
+            "Skipping .long symlink verification (not applicable for cross-sectional studies)."
         )
 
-    # Optional tables
-    if args.aseg:
-        if args.link_dry_run:
-            print(
-                "[INFO] Skipping asegstats2table due to --link-dry-run (symlinks not actually created)."
-            )
-        elif shutil.which("asegstats2table") is None:
-            print(
-                "[WARN] asegstats2table not found in PATH; skipping --aseg. Ensure FreeSurfer is sourced.",
-                file=sys.stderr,
-            )
-        else:
-            rc = run_asegstats2table(out_path, subj_dir, study_type=study_type)
-            if rc != 0:
-                return rc
-    if args.aparc:
+    if not stages_requested:
+        return 0
+
+    # Optional stages: gate each one here, then run the selected ones concurrently; they
+    # only read SUBJECTS_DIR and write disjoint outputs
+    stages: List[Tuple[str, Callable[[], int]]] = []
+    surf_ready = args.surf and tools.mris_preproc and tools.mri_surf2surf
+    # Create the .long links surface prep needs before anything reads SUBJECTS_DIR or
+    # the stage keys below take its mtime
+    if surf_ready and study_type == "longitudinal" and not args.link_dry_run:
+        _auto_link_long(subj_dir)
+    # Without --force, a stage is skipped when its outputs are newer than the QDEC and the
+    # per-subject files its tool reads
+    fsids = _qdec_column(header, rows, "fsid")
+    stage_subjects = fsids
+    if study_type == "longitudinal" and "fsid" in header and "fsid-base" in header:
+        fi, bi = header.index("fsid"), header.index("fsid-base")
+        stage_subjects = [f"{r[fi]}.long.{r[bi]}" for r in rows if len(r) > max(fi, bi)]
+    # The manifest additionally remembers the QDEC content and arguments each stage last
+    # succeeded with
+    manifest_path = stage_manifest_path(out_path)
+    manifest = {} if args.force else load_stage_manifest(manifest_path)
+    stage_keys: Dict[str, Optional[str]] = {}
+    digest = qdec_digest(header, rows)
+
+    def stage_key(name: str, kw: Dict[str, object], stamps: Sequence) -> str:
+        return _stage_key(name, stamps, (digest, study_type, sorted(kw.items())))
+
+    # fsqc is launched right before the table and surface stages and runs in the background
+    # while they execute; it is waited on just before returning
+    qc_start: Optional[Callable[[], Optional[subprocess.Popen]]] = None
+    qc_proc: Optional[subprocess.Popen] = None
+    qc_root = args.qc_output if args.qc_output else out_path.parent / "fsqc"
+    qc_kw = {
+        "pick_from": args.qc_from,
+        "fastsurfer": args.qc_fastsurfer,
+        "screenshots": args.qc_screenshots,
+        "surfaces": qc_surfaces_effective,
+        "skullstrip": args.qc_skullstrip,
+        "outlier": args.qc_outlier,
+        "html": args.qc_html,
+        "skip_existing": args.qc_skip_existing,
+    }
+    qc_marker = qc_root / "fsqc-results.csv"
+    qc_subjects = fsids if args.qc_from == "fsid" else _qdec_column(header, rows, "fsid-base")
+    qc_inputs = stage_input_files(subj_dir, list(dict.fromkeys(qc_subjects)), ["stats/aseg.stats"])
+    # fsqc's results depend on its options, so only the manifest (which keys on them) can
+    # tell that a previous run is still valid
+    qc_key = stage_key("qc", qc_kw, stat_inputs(qc_inputs)) if args.qc else None
+    if args.qc and not args.force and _stage_cached(manifest, "qc", qc_key, [qc_marker]):
+        print("[SKIP] fsqc results are up to date (use --force to rerun).")
+    elif args.qc:
+        stage_keys["qc"] = qc_key
+        qc_start = functools.partial(
+            start_fsqc,
+            out_path,
+            subj_dir,
+            outdir=args.qc_output,
+            force=args.force,
+            qdec_header=header,
+            qdec_rows=rows,
+            **qc_kw,
+        )
+
+    # aparc tables are named after the parcellation actually found, not the requested one;
+    # run_aparcstats2table is handed the result instead of scanning subjects_dir again
+    aparc_parc = args.aparc_parc
+    aparc_found = True
+    if args.aparc and tools.aparc and not args.link_dry_run:
+        detected = _detected_aparc_parc(subj_dir, args.aparc_parc, args.aparc_hemis, study_type)
+        aparc_found = detected is not None
+        aparc_parc = detected or args.aparc_parc
+    aparc_kw = {
+        "parc": aparc_parc,
+        "measures": args.aparc_measures,
+        "hemis": args.aparc_hemis,
+        "detect_parc": False,
+    }
+    table_stages = [
+        TableStage(
+            name="aseg",
+            binname="asegstats2table",
+            enabled=args.aseg,
+            available=tools.aseg,
+            outputs=[aseg_table_path(out_path, study_type)],
+            inputs=stage_input_files(subj_dir, stage_subjects, ["stats/aseg.stats"]),
+            run=run_asegstats2table,
+            kw={},
+            skip_msg="aseg table is up to date",
+        ),
+        TableStage(
+            name="aparc",
+            binname="aparcstats2table",
+            enabled=args.aparc and aparc_found,
+            available=tools.aparc,
+            outputs=[
+                aparc_table_path(out_path, hemi, aparc_parc, meas, study_type)
+                for hemi in args.aparc_hemis
+                for meas in args.aparc_measures
+            ],
+            inputs=stage_input_files(
+                subj_dir,
+                stage_subjects,
+                [f"stats/{hemi}.{aparc_parc}.stats" for hemi in args.aparc_hemis],
+            ),
+            run=functools.partial(run_aparcstats2table, max_workers=int(args.jobs)),
+            kw=aparc_kw,
+            skip_msg="aparc tables are up to date",
+        ),
+    ]
+    qdec_stamp = stat_inputs([out_path])
+    for st in table_stages:
+        if not st.enabled:
+            continue
         if args.link_dry_run:
-            print(
-                "[INFO] Skipping aparcstats2table due to --link-dry-run (symlinks not actually created)."
+            logger.info(
+                f"Skipping {st.binname} due to --link-dry-run (symlinks not actually created)."
             )
-        elif shutil.which("aparcstats2table") is None:
-            print(
-                "[WARN] aparcstats2table not found in PATH; skipping --aparc. Ensure FreeSurfer is sourced.",
-                file=sys.stderr,
+            continue
+        if not st.available:
+            logger.warning(
+                f"{st.binname} not found in PATH; skipping --{st.name}. Ensure FreeSurfer is sourced."
             )
+            continue
+        # Each input is stat'ed once; the key serves the cache check and the manifest update
+        stamps = stat_inputs(st.inputs)
+        key = stage_key(st.name, st.kw, stamps)
+        if not args.force and (
+            _stage_cached(manifest, st.name, key, st.outputs)
+            or outputs_up_to_date(st.outputs, [*qdec_stamp, *stamps])
+        ):
+            print(f"[SKIP] {st.skip_msg} (use --force to rebuild).")
         else:
-            rc = run_aparcstats2table(
-                out_path,
-                subj_dir,
-                parc=args.aparc_parc,
-                measures=args.aparc_measures,
-                hemis=args.aparc_hemis,
-                study_type=study_type,
+            stage_keys[st.name] = key
+            stages.append(
+                (
+                    st.name,
+                    functools.partial(
+                        st.run,
+                        out_path,
+                        subj_dir,
+                        study_type=study_type,
+                        qdec_header=header,
+                        qdec_rows=rows,
+                        **st.kw,
+                    ),
+                )
             )
-            if rc != 0:
-                return rc
     # Optional mass-univariate surface data
-    if args.surf:
-        have_mris = shutil.which("mris_preproc") is not None
-        have_surf2 = shutil.which("mri_surf2surf") is not None
-        if not (have_mris and have_surf2):
-            missing = [
-                n
-                for n, ok in (("mris_preproc", have_mris), ("mri_surf2surf", have_surf2))
-                if not ok
-            ]
-            print(
-                f"[WARN] Missing FreeSurfer binaries ({', '.join(missing)}); skipping --surf.",
-                file=sys.stderr,
-            )
-        else:
-            # Determine smoothing kernels list
-            smooth_list = _coerce_int_list(getattr(args, "smooth", None))
-            if not smooth_list:
-                # fallback to single kernel from --surf-fwhm
-                try:
-                    smooth_list = [int(args.surf_fwhm)]
-                except Exception:
-                    smooth_list = [10]
-            rc = run_surf_mass_univariate(
-                out_path,
-                subj_dir,
-                target=str(args.surf_target),
-                measures=list(args.surf_measures),
-                hemis=list(args.surf_hemis),
-                smooth_kernels=smooth_list,
-                outdir=args.surf_outdir,
-                force=bool(args.force),
-                dry_run=bool(args.link_dry_run),
-                study_type=study_type,
+    if args.surf and not surf_ready:
+        missing = [
+            n
+            for n, ok in (
+                ("mris_preproc", tools.mris_preproc),
+                ("mri_surf2surf", tools.mri_surf2surf),
             )
-            if rc != 0:
-                # do not fail the entire prep if surface prep tools missing; return code already logged
-                pass
-    # Optional fsqc QC
-    if args.qc:
-        _ = run_fsqc(
-            out_path,
+            if not ok
+        ]
+        logger.warning(f"Missing FreeSurfer binaries ({', '.join(missing)}); skipping --surf.")
+    elif args.surf:
+        surf_kw = {
+            "target": str(args.surf_target),
+            "measures": args.surf_measures,
+            "hemis": args.surf_hemis,
+            "smooth_kernels": args.smooth,
+            "outdir": args.surf_outdir,
+        }
+        surf_root = args.surf_outdir if args.surf_outdir else out_path.parent / "surf"
+        surf_inputs = stage_input_files(
             subj_dir,
-            outdir=args.qc_output,
-            pick_from=args.qc_from,
-            fastsurfer=bool(args.qc_fastsurfer),
-            screenshots=bool(args.qc_screenshots),
-            surfaces=bool(qc_surfaces_effective),
-            skullstrip=bool(args.qc_skullstrip),
-            outlier=bool(args.qc_outlier),
-            html=bool(args.qc_html),
-            skip_existing=bool(args.qc_skip_existing),
-            force=bool(args.force),
+            stage_subjects,
+            [f"surf/{hemi}.{meas}" for hemi in args.surf_hemis for meas in args.surf_measures],
         )
-    return 0
+        surf_stamps = stat_inputs(surf_inputs)
+        surf_key = stage_key("surf", surf_kw, surf_stamps)
+        # Pairs without any input file are skipped by the stage and produce no .mgh files
+        surf_present = {os.path.basename(p) for p, ns in surf_stamps if ns is not None}
+        surf_pairs = [
+            (hemi, meas)
+            for hemi in args.surf_hemis
+            for meas in args.surf_measures
+            if f"{hemi}.{meas}" in surf_present
+        ]
+        surf_outputs = [
+            *surf_output_paths(surf_root, surf_pairs, args.smooth),
+            surf_root / "qc_summary.tsv",
+        ]
+        if not args.force and _stage_cached(manifest, "surf", surf_key, surf_outputs):
+            print("[SKIP] surface data is up to date (use --force to rebuild).")
+        else:
+            if not args.link_dry_run:
+                stage_keys["surf"] = surf_key
+            stages.append(
+                (
+                    "surf",
+                    functools.partial(
+                        run_surf_mass_univariate,
+                        out_path,
+                        subj_dir,
+                        force=args.force,
+                        dry_run=args.link_dry_run,
+                        study_type=study_type,
+                        qdec_header=header,
+                        qdec_rows=rows,
+                        link_long=False,
+                        **surf_kw,
+                    ),
+                )
+            )
+    workers = max(1, min(len(stages), int(args.jobs)))
+    rcs: Dict[str, int] = {}
+    failed = Stage(0)
+    # With --fail-fast, set by the first failing stage; stages that see it set do not start.
+    # Checked in the worker rather than via Future.cancel(), which misses stages that a free
+    # worker has already picked up
+    abort = threading.Event()
+
+    def run_stage(name: str, fn: Callable[[], int]) -> Optional[int]:
+        """Run one stage; None if it was not started because another stage failed first."""
+        if abort.is_set():
+            return None
+        rc = _run_stage(name, fn)
+        if rc != 0 and args.fail_fast:
+            abort.set()
+        return rc
+
+    # Stage output is printed as it happens, each line prefixed with the stage name
+    try:
+        # Started inside the try so that the finally below always reaps it
+        if qc_start is not None:
+            qc_proc = qc_start()
+        with _prefix_stage_output(), ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(run_stage, name, fn): name for name, fn in stages}
+            for fut in as_completed(futures):
+                name = futures[fut]
+                rc = fut.result()
+                if rc is None:
+                    # Not started under --fail-fast; reported as failed
+                    logger.warning(f"Not running the {name} stage after an earlier failure.")
+                    failed |= Stage[name.upper()]
+                    continue
+                rcs[name] = rc
+                if rc != 0:
+                    failed |= Stage[name.upper()]
+    finally:
+        if qc_proc is not None:
+            rcs["qc"] = finish_fsqc(qc_proc, qc_root)
+            if rcs["qc"] != 0:
+                failed |= Stage.QC
+    recorded = {
+        name: (key, rcs[name])
+        for name, key in stage_keys.items()
+        if key is not None and name in rcs
+    }
+    if recorded:
+        try:
+            record_stages(manifest_path, recorded)
+        except OSError as e:
+            logger.warning(f"Failed to update stage manifest {manifest_path}: {e}")
+    if failed:
+        names = ", ".join(st.name.lower() for st in Stage if st in failed)
+        logger.warning(f"Failed stages: {names} (exit status {int(failed)})")
+    return int(failed)
 
 
 if __name__ == "__main__":